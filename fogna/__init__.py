@@ -0,0 +1,3 @@
+"""
+⚽ FOGNA - Logica di base (ingestione, database, statistiche)
+"""
@@ -0,0 +1,71 @@
+"""
+Tabella aggregata team_season_stats (una riga per squadra/campionato/stagione)
+- Statistiche separate casa / trasferta
+- Aggiornata solo per le stagioni toccate da caricamenti ed eliminazioni
+"""
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS team_season_stats (
+        season TEXT,
+        league TEXT,
+        team TEXT,
+        home_played INTEGER,
+        home_wins INTEGER,
+        home_draws INTEGER,
+        home_losses INTEGER,
+        home_gf INTEGER,
+        home_ga INTEGER,
+        home_points INTEGER,
+        away_played INTEGER,
+        away_wins INTEGER,
+        away_draws INTEGER,
+        away_losses INTEGER,
+        away_gf INTEGER,
+        away_ga INTEGER,
+        away_points INTEGER,
+        UNIQUE (season, league, team)
+    )
+'''
+
+# Ricalcolo di una stagione: una riga per lato (casa/trasferta) di ogni partita,
+# raggruppata su chiavi intere; i nomi vengono aggiunti solo alla fine
+REFRESH_SQL = '''
+    INSERT INTO team_season_stats
+    SELECT ?, l.code, t.name,
+           agg.home_played, agg.home_wins, agg.home_draws, agg.home_losses,
+           agg.home_gf, agg.home_ga, agg.home_points,
+           agg.away_played, agg.away_wins, agg.away_draws, agg.away_losses,
+           agg.away_gf, agg.away_ga, agg.away_points
+    FROM (
+        SELECT league_id, team_id,
+               SUM(is_home) AS home_played,
+               SUM(is_home * (gf > ga)) AS home_wins,
+               SUM(is_home * (gf = ga)) AS home_draws,
+               SUM(is_home * (gf < ga)) AS home_losses,
+               SUM(is_home * gf) AS home_gf,
+               SUM(is_home * ga) AS home_ga,
+               SUM(is_home * ((gf > ga) * 3 + (gf = ga))) AS home_points,
+               SUM(1 - is_home) AS away_played,
+               SUM((1 - is_home) * (gf > ga)) AS away_wins,
+               SUM((1 - is_home) * (gf = ga)) AS away_draws,
+               SUM((1 - is_home) * (gf < ga)) AS away_losses,
+               SUM((1 - is_home) * gf) AS away_gf,
+               SUM((1 - is_home) * ga) AS away_ga,
+               SUM((1 - is_home) * ((gf > ga) * 3 + (gf = ga))) AS away_points
+        FROM (
+            SELECT league_id, home_id AS team_id, 1 AS is_home, fthg AS gf, ftag AS ga
+            FROM match_data WHERE season_id IS ?
+            UNION ALL
+            SELECT league_id, away_id AS team_id, 0 AS is_home, ftag AS gf, fthg AS ga
+            FROM match_data WHERE season_id IS ?
+        )
+        GROUP BY league_id, team_id
+    ) agg
+    JOIN leagues l ON l.id = agg.league_id
+    JOIN teams t ON t.id = agg.team_id
+'''
+
+
+def refresh_season(conn, season, season_id):
+    """Inserisce le righe aggregate di una stagione già svuotata (vedi storage.refresh_materialized)"""
+    conn.execute(REFRESH_SQL, (season, season_id, season_id))
@@ -0,0 +1,317 @@
+"""
+Benchmark su dati sintetici: caricamento e query di tutte le pagine
+- Genera workbook in stile all-euro-data (stagioni x campionati x squadre, ~100 colonne quote)
+- Esegue gli stessi percorsi di codice dell'app, senza browser
+- Stampa throughput e latenze p50/p95 in JSON
+- Con --app: avvio a freddo e costo dei rerun dell'app Streamlit (database della cartella corrente)
+
+Uso da riga di comando:
+    python -m fogna.bench --seasons 3 --leagues 10 --teams 20 --repeat 20 [--out bench.json]
+    python -m fogna.bench --baseline bench.json   # esce con 1 se un p95 peggiora oltre la tolleranza
+    python -m fogna.bench --app [app_streamlit.py] --repeat 20
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Codici reali dei campionati football-data, poi codici generici
+LEAGUE_CODES = [
+    'E0', 'E1', 'E2', 'E3', 'EC', 'SC0', 'SC1', 'SC2', 'SC3', 'D1', 'D2',
+    'I1', 'I2', 'SP1', 'SP2', 'F1', 'F2', 'N1', 'B1', 'P1', 'T1', 'G1'
+]
+
+STAT_HEADER = [
+    'Div', 'Date', 'Time', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR',
+    'HTHG', 'HTAG', 'HTR', 'HS', 'AS', 'HST', 'AST', 'HF', 'AF', 'HC', 'AC',
+    'HY', 'AY', 'HR', 'AR'
+]
+
+BOOKMAKERS = ['B365', 'BW', 'IW', 'PS', 'WH', 'VC', 'Max', 'Avg']
+
+
+def _odds_header(count):
+    """Nomi delle colonne quote (B365H, B365D, ...), quante ne servono"""
+    names = []
+    for suffix in ['H', 'D', 'A', '>2.5', '<2.5', 'AHH', 'AHA', 'CH', 'CD', 'CA', 'C>2.5', 'C<2.5', 'CAHH']:
+        for bookmaker in BOOKMAKERS:
+            names.append(f"{bookmaker}{suffix}")
+    while len(names) < count:
+        names.append(f"X{len(names)}")
+    return names[:count]
+
+
+def league_code(i):
+    """Codice del campionato i-esimo"""
+    return LEAGUE_CODES[i] if i < len(LEAGUE_CODES) else f"L{i}"
+
+
+def generate_workbook(path, season, leagues=10, teams=20, odds=100, seed=0):
+    """Scrive un workbook sintetico: un foglio per campionato, girone di andata e ritorno"""
+    import openpyxl
+
+    rng = random.Random(f"{seed}-{season}")
+    start = datetime.datetime(int(season[:4]), 8, 1)
+    header = STAT_HEADER + _odds_header(odds)
+
+    wb = openpyxl.Workbook(write_only=True)
+    for i in range(leagues):
+        code = league_code(i)
+        ws = wb.create_sheet(code)
+        ws.append(header)
+        names = [f"{code} Team {t + 1}" for t in range(teams)]
+        strength = {name: rng.uniform(0.6, 1.6) for name in names}
+
+        for home in names:
+            for away in names:
+                if home == away:
+                    continue
+                hg = min(int(rng.expovariate(1 / (1.5 * strength[home] / strength[away] ** 0.5))), 9)
+                ag = min(int(rng.expovariate(1 / (1.1 * strength[away] / strength[home] ** 0.5))), 9)
+                hthg, htag = rng.randint(0, hg), rng.randint(0, ag)
+                date = start + datetime.timedelta(days=rng.randint(0, 290))
+                ws.append(
+                    [code, date, datetime.time(rng.choice([12, 15, 18, 20]), 0), home, away,
+                     hg, ag, 'H' if hg > ag else 'D' if hg == ag else 'A',
+                     hthg, htag, 'H' if hthg > htag else 'D' if hthg == htag else 'A']
+                    + [rng.randint(3, 25), rng.randint(3, 25), rng.randint(0, 12), rng.randint(0, 12),
+                       rng.randint(5, 20), rng.randint(5, 20), rng.randint(0, 12), rng.randint(0, 12),
+                       rng.randint(0, 5), rng.randint(0, 5), rng.randint(0, 1), rng.randint(0, 1)]
+                    + [round(rng.uniform(1.05, 12.0), 2) for _ in range(odds)]
+                )
+    wb.save(path)
+
+
+def _percentile(values, pct):
+    """Percentile (nearest-rank) di una lista di durate"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def _summary(durations, rows=None):
+    """Statistiche di una serie di misure (secondi -> millisecondi)"""
+    result = {
+        'runs': len(durations),
+        'p50_ms': round(_percentile(durations, 50) * 1000, 3),
+        'p95_ms': round(_percentile(durations, 95) * 1000, 3),
+        'mean_ms': round(sum(durations) / len(durations) * 1000, 3),
+    }
+    if rows is not None:
+        result['rows'] = rows
+        result['rows_per_sec'] = round(rows * len(durations) / sum(durations), 1)
+    return result
+
+
+def _timed(fn, repeat):
+    """Esegue fn() repeat volte: (durate, ultimo risultato)"""
+    durations = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        durations.append(time.perf_counter() - start)
+    return durations, result
+
+
+def run(seasons=3, leagues=10, teams=20, odds=100, repeat=20, workdir=None):
+    """Esegue l'intero benchmark e restituisce il dizionario dei risultati"""
+    from fogna import queries
+    from fogna.export import export_csv_gz
+    from fogna.head_to_head import head_to_head_matrix, pair_matches, pair_summary
+    from fogna.ingest import extract_season_from_filename
+    from fogna.rankings import best_teams, rankings_order, team_rankings
+    from fogna.sequences import league_form, team_form
+    from fogna.standings import league_standings
+    from fogna.storage import connect, create_schema, delete_season, ingest_workbook
+    from fogna.teams import search_teams
+
+    workdir = workdir or tempfile.mkdtemp(prefix='fogna_bench_')
+    conn = connect(os.path.join(workdir, 'bench.db'))
+    create_schema(conn)
+    results = {}
+
+    # Generazione dei file (non misurata)
+    files = []
+    for i in range(seasons):
+        year = 2024 - seasons + 1 + i
+        path = os.path.join(workdir, f"all-euro-data-{year}-{year + 1}.xlsx")
+        generate_workbook(path, f"{year}-{year + 1}", leagues, teams, odds)
+        files.append(path)
+
+    # Caricamento: stesso percorso del pulsante "🚀 CARICA FILE"
+    durations = []
+    total_rows = 0
+    for path in files:
+        season = extract_season_from_filename(os.path.basename(path))
+        start = time.perf_counter()
+        total_rows += ingest_workbook(conn, path, season)['rows']
+        durations.append(time.perf_counter() - start)
+    results['upload'] = _summary(durations, total_rows // len(files))
+
+    # Ricaricamento dello stesso file: tutti i fogli invariati
+    durations, _ = _timed(lambda: ingest_workbook(conn, files[-1], extract_season_from_filename(
+        os.path.basename(files[-1]))), max(1, repeat // 4))
+    results['upload_unchanged'] = _summary(durations)
+
+    all_seasons = [row[0] for row in conn.execute(queries.SEASONS)]
+    league = league_code(0)
+
+    def home():
+        for sql in (queries.COUNT_MATCHES, queries.COUNT_SEASONS, queries.COUNT_LEAGUES,
+                    queries.COUNT_TEAMS, queries.SEASONS):
+            conn.execute(sql).fetchall()
+
+    durations, _ = _timed(home, repeat)
+    results['home_metrics'] = _summary(durations)
+
+    # Aggregati di tutte le stagioni (una volta), poi solo soglia e ordinamento in memoria
+    durations, tables = _timed(lambda: team_rankings(conn, all_seasons), repeat)
+    results['best_teams'] = _summary(durations, len(tables[0]))
+    durations, rows = _timed(lambda: best_teams(tables[0], 20, rankings_order('points')), repeat)
+    results['best_teams_threshold'] = _summary(durations, len(rows))
+
+    durations, table = _timed(lambda: league_standings(conn, league, all_seasons[0]), repeat)
+    results['classifiche'] = _summary(durations, len(table))
+
+    # Forma e serie: tutte le squadre di un campionato, poi una squadra su tutte le stagioni
+    durations, table = _timed(lambda: league_form(conn, league, all_seasons[0]), repeat)
+    results['league_form'] = _summary(durations, len(table))
+    durations, _ = _timed(lambda: team_form(conn, table['team'].iloc[0]), repeat)
+    results['team_form'] = _summary(durations)
+
+    # Scontri diretti: una coppia su tutte le stagioni, poi la matrice di un campionato
+    team, opponent = table['team'].iloc[0], table['team'].iloc[1]
+    durations, _ = _timed(lambda: (pair_summary(conn, team, opponent),
+                                   pair_matches(conn, team, opponent)), repeat)
+    results['head_to_head'] = _summary(durations)
+    durations, matrix = _timed(lambda: head_to_head_matrix(conn, league, all_seasons[0]), repeat)
+    results['head_to_head_matrix'] = _summary(durations, len(matrix))
+
+    # Ricerca squadra: grafia sbagliata risolta sull'indice trigram degli alias
+    typo = team.lower().replace('team', 'taem')
+    durations, found = _timed(lambda: search_teams(conn, typo), repeat)
+    results['team_search'] = _summary(durations, len(found))
+
+    def export_csv():
+        path, rows = export_csv_gz(conn)
+        size = os.path.getsize(path)
+        os.remove(path)
+        return rows, size
+
+    durations, (rows, size) = _timed(export_csv, max(1, repeat // 4))
+    results['csv_export'] = _summary(durations, rows)
+    results['csv_export']['bytes'] = size
+
+    # Eliminazione: ogni stagione una volta, dalla più vecchia
+    durations = []
+    for season in reversed(all_seasons):
+        start = time.perf_counter()
+        delete_season(conn, season)
+        durations.append(time.perf_counter() - start)
+    results['delete_season'] = _summary(durations)
+
+    conn.close()
+    return {
+        'config': {
+            'seasons': seasons, 'leagues': leagues, 'teams': teams,
+            'odds_columns': odds, 'repeat': repeat,
+            'matches': total_rows,
+        },
+        'results': results,
+    }
+
+
+def app_startup(script='app_streamlit.py', repeat=20):
+    """Avvio a freddo e rerun dell'app con Streamlit AppTest (da eseguire in un processo nuovo)"""
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    import_streamlit = time.perf_counter() - start
+
+    # Percorso assoluto: AppTest risolve quelli relativi rispetto a questo modulo
+    at = AppTest.from_file(os.path.abspath(script), default_timeout=60)
+    # Sessione già autenticata: si misura l'app, non il login
+    at.session_state['autenticato'] = True
+    at.session_state['tipo_utente'] = 'admin'
+    at.session_state['nome_utente'] = 'Amministratore'
+
+    # Primo run: import dell'app, configurazione, connessioni e Home
+    start = time.perf_counter()
+    at.run()
+    results = {
+        'import_streamlit': _summary([import_streamlit]),
+        'cold_start': _summary([time.perf_counter() - start]),
+    }
+    heavy = [name for name in ('pandas', 'numpy', 'openpyxl') if name in sys.modules]
+
+    # Rerun (ogni clic): una volta per scaldare, poi misurati
+    for page in at.sidebar.radio[0].options:
+        if page in ("📤 Carica File", "🗂️ Gestione Dati"):
+            continue
+        at.sidebar.radio[0].set_value(page)
+        at.run()
+        durations, _ = _timed(at.run, repeat)
+        if at.exception:
+            raise RuntimeError(f"{page}: {at.exception[0].value}")
+        name = page.split(' ', 1)[1].lower().replace(' ', '_')
+        results[f"rerun_{name}"] = _summary(durations)
+
+    return {
+        'config': {'script': script, 'repeat': repeat, 'heavy_modules_after_home': heavy},
+        'results': results,
+    }
+
+
+def compare(report, baseline, tolerance=0.25):
+    """Misure con p95 peggiorato di oltre tolerance rispetto al riferimento"""
+    regressions = []
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous and current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append((name, previous['p95_ms'], current['p95_ms']))
+    return regressions
+
+
+def main(argv=None):
+    """Entry point da riga di comando"""
+    parser = argparse.ArgumentParser(description="Benchmark FOGNA su dati sintetici")
+    parser.add_argument('--seasons', type=int, default=3)
+    parser.add_argument('--leagues', type=int, default=10)
+    parser.add_argument('--teams', type=int, default=20)
+    parser.add_argument('--odds', type=int, default=100, help="colonne quote per foglio")
+    parser.add_argument('--repeat', type=int, default=20, help="ripetizioni per ogni query")
+    parser.add_argument('--out', help="file JSON di output (default: stdout)")
+    parser.add_argument('--baseline', help="JSON di un'esecuzione precedente da confrontare")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="peggioramento p95 ammesso (0.25 = +25%%)")
+    parser.add_argument('--app', nargs='?', const='app_streamlit.py', metavar='SCRIPT',
+                        help="misura avvio e rerun dell'app invece del database")
+    args = parser.parse_args(argv)
+
+    if args.app:
+        report = app_startup(args.app, args.repeat)
+    else:
+        report = run(args.seasons, args.leagues, args.teams, args.odds, args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for name, before, after in regressions:
+            print(f"❌ {name}: p95 {before} ms -> {after} ms", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
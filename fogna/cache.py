@@ -0,0 +1,68 @@
+"""
+Cache dei risultati delle query, condivisa tra tutte le sessioni
+- Chiave: (query, parametri, generazione dati)
+- Ogni scrittura incrementa la generazione -> i risultati vecchi non vengono più usati
+- Dimensione limitata con eliminazione LRU
+"""
+
+import threading
+from collections import OrderedDict
+
+from fogna.storage import data_generation
+
+# Risultati tenuti in memoria al massimo
+MAX_ENTRIES = 256
+
+
+class QueryCache:
+    """Cache LRU thread-safe dei risultati, invalidata dalla generazione dati"""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, conn, key, compute):
+        """Restituisce il valore in cache per key, altrimenti lo calcola con compute(conn)"""
+        generation = data_generation(conn)
+        full_key = (key, generation)
+
+        with self._lock:
+            if generation != self._generation:
+                # Dati cambiati: i risultati delle generazioni precedenti non servono più
+                self._entries.clear()
+                self._generation = generation
+            if full_key in self._entries:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                return self._entries[full_key]
+            self.misses += 1
+
+        value = compute(conn)
+
+        with self._lock:
+            if generation != self._generation:
+                return value
+            self._entries[full_key] = value
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def fetchall(self, conn, sql, params=()):
+        """Come cursor.fetchall(), con i risultati in cache (tupla di righe)"""
+        params = tuple(params)
+        return self.get(conn, (sql, params), lambda c: tuple(c.execute(sql, params).fetchall()))
+
+    def fetchone(self, conn, sql, params=()):
+        """Come cursor.fetchone(), con il risultato in cache"""
+        rows = self.fetchall(conn, sql, params)
+        return rows[0] if rows else None
+
+    def clear(self):
+        """Svuota la cache"""
+        with self._lock:
+            self._entries.clear()
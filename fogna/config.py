@@ -0,0 +1,57 @@
+"""
+Configurazione dell'app, risolta UNA volta per processo (non a ogni rerun)
+- LOCALE: hostname del PC di sviluppo -> password predefinite
+- ONLINE: password da st.secrets["passwords"]
+"""
+
+import functools
+import socket
+
+# Password usate in locale e quando i secrets non sono disponibili
+PASSWORD_LOCALI = {"admin": "fogna", "utente": "vinceremo"}
+
+LOCALE = "🏠 LOCALE"
+ONLINE = "🌐 ONLINE"
+
+
+def _is_locale(hostname):
+    """True se hostname è quello del PC locale (non "streamlit" o simili)"""
+    return "desktop" in hostname.lower() or "pc" in hostname.lower() or hostname.startswith("DESKTOP-")
+
+
+def _password():
+    """(password admin, password utente, modalità)"""
+    try:
+        if _is_locale(socket.gethostname()):
+            return PASSWORD_LOCALI["admin"], PASSWORD_LOCALI["utente"], LOCALE
+    except Exception:
+        return PASSWORD_LOCALI["admin"], PASSWORD_LOCALI["utente"], LOCALE
+
+    # ONLINE - usa secrets
+    try:
+        import streamlit as st
+
+        return st.secrets["passwords"]["admin"], st.secrets["passwords"]["utente"], ONLINE
+    except Exception:
+        return PASSWORD_LOCALI["admin"], PASSWORD_LOCALI["utente"], LOCALE
+
+
+@functools.lru_cache(maxsize=None)
+def get_config():
+    """Modalità (LOCALE/ONLINE) e credenziali dei due livelli di accesso"""
+    admin_password, utente_password, mode = _password()
+    return {
+        "mode": mode,
+        "credenziali": {
+            "admin": {
+                "password": admin_password,
+                "ruolo": "Amministratore",
+                "icona": "👑"
+            },
+            "utente": {
+                "password": utente_password,
+                "ruolo": "Utente",
+                "icona": "👤"
+            }
+        },
+    }
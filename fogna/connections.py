@@ -0,0 +1,244 @@
+"""
+Gestione connessioni SQLite condivise tra le sessioni Streamlit
+- Lettori: piccolo pool di connessioni allo snapshot pubblicato (immutable, memory-mapped),
+  condiviso tra i thread: Streamlit esegue ogni rerun su un thread nuovo
+- Letture lunghe (esportazione): connessione riservata con dedicated_reader()
+- Scrittore: UNA connessione al database, usata da un solo thread alla volta
+- Dopo ogni scrittura che cambia i dati viene pubblicato un nuovo snapshot (vedi fogna.snapshot);
+  i lettori passano al nuovo file alla prima query successiva
+- Le scritture di altri processi (python -m fogna.importer) si vedono dal database vivo:
+  reader() confronta id e generazione con lo snapshot corrente e ripubblica se sono cambiati
+- Con timings tutte le connessioni registrano le query (vedi fogna.diagnostics)
+
+Misura del throughput in lettura da riga di comando (lavora su una copia del database):
+    python -m fogna.connections [percorso_db] [lettori] [secondi]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+from fogna import snapshot
+from fogna.diagnostics import TimedConnection
+from fogna.storage import DB_PATH, PRAGMAS, connect, create_schema, data_generation
+
+# PRAGMA delle connessioni di sola lettura (journal_mode e auto_vacuum li decide lo scrittore)
+READER_PRAGMAS = [
+    p for p in PRAGMAS if 'journal_mode' not in p and 'auto_vacuum' not in p
+] + ["PRAGMA query_only = 1"]
+
+# Snapshot letti tramite mmap: le pagine stanno nella page cache del sistema operativo
+SNAPSHOT_PRAGMAS = READER_PRAGMAS + ["PRAGMA mmap_size = 268435456"]
+
+# Connessioni di lettura aperte per ogni snapshot (assegnate a turno)
+READER_POOL = 4
+
+
+class ConnectionManager:
+    """Pool di connessioni di lettura + una connessione di scrittura serializzata
+
+    Con snapshots=False i lettori aprono il database in sola lettura (mode=ro) invece degli snapshot.
+    """
+
+    def __init__(self, path=DB_PATH, timings=None, snapshots=True):
+        self.path = path
+        self.timings = timings
+        self.snapshots = snapshots
+        self._factory = sqlite3.Connection if timings is None else TimedConnection
+        # Lo scrittore crea schema e file WAL prima che si apra qualunque lettore
+        self._writer = self._timed(connect(path, self._factory))
+        create_schema(self._writer)
+        self._writer_lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        # (versione, snapshot corrente): il pool di una versione diversa viene sostituito
+        self._current = (0, None)
+        self._pool = (None, [])
+        self._turn = itertools.count()
+        if snapshots:
+            # Connessione al database vivo: solo per leggere id e generazione (vedi reader)
+            self._live = self._open_reader(None)
+            self._live_lock = threading.Lock()
+            self.publish()
+
+    def _timed(self, conn):
+        """Collega la connessione al buffer delle misure (se presente)"""
+        if self.timings is not None:
+            conn.timings = self.timings
+        return conn
+
+    def publish(self):
+        """Pubblica lo snapshot della generazione corrente e vi sposta i lettori"""
+        path = snapshot.publish(self._writer, self.path)
+        version, current = self._current
+        if path != current:
+            self._current = (version + 1, path)
+
+    def _check_live(self):
+        """Ripubblica lo snapshot se il database è cambiato fuori da writer() (altri processi)
+
+        Se lo scrittore è occupato si lascia fare a lui: writer() pubblica all'uscita.
+        """
+        with self._live_lock:
+            path = snapshot.current_path(self._live, self.path)
+        if path != self._current[1] and self._writer_lock.acquire(blocking=False):
+            try:
+                self.publish()
+            finally:
+                self._writer_lock.release()
+
+    def _open_reader(self, path):
+        """Nuova connessione di sola lettura allo snapshot (o al database se path è None)"""
+        if path is not None:
+            conn = snapshot.open_snapshot(path, self._factory)
+            pragmas = SNAPSHOT_PRAGMAS
+        else:
+            uri = f"file:{os.path.abspath(self.path)}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, factory=self._factory)
+            pragmas = READER_PRAGMAS
+        for pragma in pragmas:
+            conn.execute(pragma)
+        return self._timed(conn)
+
+    def reader(self):
+        """Connessione di sola lettura dal pool dello snapshot corrente (aperta al primo uso)
+
+        Le connessioni sono condivise tra i thread (check_same_thread=False) e restano aperte
+        tra un rerun e l'altro. Il pool di uno snapshot superato viene solo abbandonato: ogni sua
+        connessione si chiude quando nessun rerun la usa più, le query in corso finiscono.
+        """
+        if self.snapshots:
+            self._check_live()
+        version, path = self._current
+        with self._pool_lock:
+            pool_version, conns = self._pool
+            if pool_version != version:
+                conns = []
+                self._pool = (version, conns)
+            turn = next(self._turn) % READER_POOL
+            if turn >= len(conns):
+                conns.append(self._open_reader(path))
+                turn = len(conns) - 1
+            return conns[turn]
+
+    @contextmanager
+    def dedicated_reader(self):
+        """Connessione di sola lettura riservata al blocco with, chiusa all'uscita
+
+        Fuori dal pool: una lettura lunga resta sullo stesso snapshot anche se ne viene
+        pubblicato uno nuovo nel frattempo.
+        """
+        if self.snapshots:
+            self._check_live()
+        conn = self._open_reader(self._current[1])
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def writer(self):
+        """Connessione di scrittura, riservata per la durata del blocco with
+
+        Se i dati sono cambiati, all'uscita viene pubblicato un nuovo snapshot.
+        """
+        with self._writer_lock:
+            generation = data_generation(self._writer)
+            yield self._writer
+            if self.snapshots and data_generation(self._writer) != generation:
+                self.publish()
+
+
+def measure_read_throughput(manager, queries_to_run, readers=8, seconds=3.0, write_job=None):
+    """Letture al secondo con N thread lettori, opzionalmente durante write_job(writer)"""
+    stop = threading.Event()
+    counts = [0] * readers
+
+    def read_loop(i):
+        conn = manager.reader()
+        while not stop.is_set():
+            for sql, params in queries_to_run:
+                conn.execute(sql, params).fetchall()
+                counts[i] += 1
+
+    def write_loop():
+        while not stop.is_set():
+            with manager.writer() as conn:
+                write_job(conn)
+
+    threads = [threading.Thread(target=read_loop, args=(i,)) for i in range(readers)]
+    if write_job is not None:
+        threads.append(threading.Thread(target=write_loop))
+
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    total = sum(counts)
+    return {'readers': readers, 'reads': total, 'reads_per_sec': round(total / elapsed, 1)}
+
+
+def main(argv=None):
+    """Confronta il throughput in lettura con e senza un caricamento in corso"""
+    import pandas as pd
+
+    from fogna import queries
+    from fogna.storage import bulk_load
+
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else DB_PATH
+    readers = int(argv[1]) if len(argv) > 1 else 8
+    seconds = float(argv[2]) if len(argv) > 2 else 3.0
+
+    # Copia del database: il caricamento simulato non tocca i dati reali
+    copy_path = os.path.join(tempfile.mkdtemp(), 'throughput.db')
+    source = sqlite3.connect(path)
+    target = sqlite3.connect(copy_path)
+    source.backup(target)
+    source.close()
+    target.close()
+
+    manager = ConnectionManager(copy_path)
+    conn = manager.reader()
+    seasons = [row[0] for row in conn.execute(queries.SEASONS)]
+    if not seasons:
+        print("⚠️ Nessuna stagione nel database")
+        return 1
+    season = seasons[0]
+    league = conn.execute(queries.LEAGUES).fetchone()[0]
+
+    page_queries = [
+        (queries.COUNT_MATCHES, ()),
+        (queries.COUNT_TEAMS, ()),
+        (queries.SEASONS, ()),
+        (queries.LEAGUE_SEASONS, (league,)),
+        (queries.LEAGUE_MATCHES, (league, queries.season_id(conn, season))),
+        queries.team_stats_query([season]),
+    ]
+
+    # Caricamento simulato: riscrive l'ultima stagione in modalità "sovrascrivi"
+    rows = pd.read_sql_query(
+        "SELECT * FROM matches WHERE season = ?", conn, params=(season,), parse_dates=['date']
+    )
+
+    def reload_season(writer):
+        bulk_load(writer, [rows], season=season, overwrite=True)
+
+    idle = measure_read_throughput(manager, page_queries, readers, seconds)
+    busy = measure_read_throughput(manager, page_queries, readers, seconds, reload_season)
+    print(f"📖 Solo letture:        {idle['reads_per_sec']} query/s ({readers} lettori)")
+    print(f"📥 Durante caricamento: {busy['reads_per_sec']} query/s ({readers} lettori)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Diagnostica dei tempi (🩺 Diagnostica)
+- Ogni query: testo, parametri, righe restituite e durata (execute + fetch)
+- Ogni pagina: tempo totale e sezioni (es. pandas, rendering)
+- Ultime misure in un buffer circolare di dimensione fissa, condiviso tra le sessioni
+- Le stesse misure come righe JSON sul logger 'fogna.timings' (livello INFO)
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Misure tenute in memoria al massimo
+MAX_ENTRIES = 1000
+
+# Lunghezza massima di SQL e parametri nelle misure
+MAX_TEXT = 300
+
+logger = logging.getLogger('fogna.timings')
+
+_SPACES = re.compile(r'\s+')
+
+
+def _short(text):
+    """Testo su una riga, troncato a MAX_TEXT caratteri"""
+    text = _SPACES.sub(' ', str(text)).strip()
+    return text if len(text) <= MAX_TEXT else text[:MAX_TEXT - 1] + '…'
+
+
+class Timings:
+    """Buffer circolare thread-safe delle ultime misure"""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self._entries = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    def record(self, kind, name, seconds, rows=None, params=None):
+        """Registra una misura ('query', 'page' o 'section') e la scrive nel log"""
+        entry = {
+            'ts': round(time.time(), 3),
+            'kind': kind,
+            'name': _short(name),
+            'ms': round(seconds * 1000, 3),
+            'rows': rows,
+            'params': _short(params) if params else None,
+        }
+        with self._lock:
+            self._entries.append(entry)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(entry, ensure_ascii=False))
+
+    @contextmanager
+    def section(self, page, name):
+        """Misura un blocco di codice di una pagina (es. 'pandas', 'render')"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record('section', f"{page} › {name}", time.perf_counter() - start)
+
+    def entries(self, kind=None):
+        """Copia delle misure, opzionalmente di un solo tipo"""
+        with self._lock:
+            entries = list(self._entries)
+        return [e for e in entries if kind is None or e['kind'] == kind]
+
+    def slowest(self, kind, limit=20):
+        """Riepilogo per nome (conteggio, media, massimo), i più lenti per primi"""
+        groups = {}
+        for entry in self.entries(kind):
+            groups.setdefault(entry['name'], []).append(entry)
+
+        summary = []
+        for name, group in groups.items():
+            durations = [e['ms'] for e in group]
+            summary.append({
+                'name': name,
+                'count': len(group),
+                'mean_ms': round(sum(durations) / len(durations), 3),
+                'max_ms': max(durations),
+                'rows': group[-1]['rows'],
+            })
+        summary.sort(key=lambda s: s['max_ms'], reverse=True)
+        return summary[:limit]
+
+    def clear(self):
+        """Svuota il buffer"""
+        with self._lock:
+            self._entries.clear()
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursore che misura execute e fetch e registra la query quando i risultati finiscono"""
+
+    _pending = None
+
+    def execute(self, sql, params=()):
+        self._finish()
+        start = time.perf_counter()
+        super().execute(sql, params)
+        self._pending = [sql, params, time.perf_counter() - start, 0]
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._finish()
+        start = time.perf_counter()
+        super().executemany(sql, seq_of_params)
+        self._record(sql, time.perf_counter() - start, self.rowcount)
+        return self
+
+    def _record(self, sql, seconds, rows, params=None):
+        """Registra la query se la connessione ha un buffer di misure"""
+        timings = self.connection.timings
+        if timings is not None:
+            timings.record('query', sql, seconds, rows, params)
+
+    def _fetched(self, start, rows, done):
+        """Somma tempo e righe di un fetch; registra la query se non ci sono altre righe"""
+        if self._pending is not None:
+            self._pending[2] += time.perf_counter() - start
+            self._pending[3] += rows
+            if done:
+                self._finish()
+
+    def _finish(self):
+        """Registra la query in corso (una volta sola)"""
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            sql, params, seconds, rows = pending
+            self._record(sql, seconds, rows, params)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(start, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(start, len(rows), not rows)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(start, len(rows), True)
+        return rows
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # Cursori abbandonati prima della fine dei risultati (es. un solo fetchone)
+        self._finish()
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connessione SQLite che registra ogni query in self.timings (se impostato)"""
+
+    timings = None
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
@@ -0,0 +1,44 @@
+"""
+Esportazione CSV in streaming (📥 Esporta)
+- Le righe arrivano dal cursore SQLite a blocchi, senza caricare la tabella in memoria
+- Il CSV viene compresso con gzip mentre viene scritto in un file temporaneo
+- Filtri opzionali per stagione, campionato e intervallo di date
+"""
+
+import csv
+import gzip
+import io
+import tempfile
+
+from fogna import queries
+
+# Righe lette dal cursore per ogni blocco
+CHUNK_SIZE = 5000
+
+
+def export_csv_gz(conn, seasons=None, leagues=None, date_from=None, date_to=None,
+                  path=None, chunk_size=CHUNK_SIZE):
+    """Scrive le partite filtrate in un CSV gzip: restituisce (percorso, righe)"""
+    ids = queries.season_ids(conn, seasons) if seasons else None
+    leagues = queries.league_ids(conn, leagues) if leagues else None
+    sql, params = queries.export_query(ids, leagues, date_from, date_to)
+
+    if path is None:
+        tmp = tempfile.NamedTemporaryFile(prefix='fogna_', suffix='.csv.gz', delete=False)
+        tmp.close()
+        path = tmp.name
+
+    rows = 0
+    with gzip.open(path, 'wb', compresslevel=6) as raw:
+        with io.TextIOWrapper(raw, encoding='utf-8', newline='') as text:
+            writer = csv.writer(text)
+            writer.writerow(queries.EXPORT_COLUMNS)
+
+            cursor = conn.execute(sql, params)
+            while True:
+                block = cursor.fetchmany(chunk_size)
+                if not block:
+                    break
+                writer.writerows(block)
+                rows += len(block)
+    return path, rows
@@ -0,0 +1,202 @@
+"""
+Scontri diretti (⚔️ Scontri Diretti)
+- Tabella pair_stats: una riga per coppia di squadre (non ordinata), campionato e stagione
+  con vittorie/pareggi/sconfitte e gol separati per chi gioca in casa
+- Aggiornata insieme a team_season_stats per le sole stagioni toccate
+- Le partite di una coppia si leggono con l'indice su (min(home_id, away_id), max(...))
+  di ogni partizione, senza scansioni
+- Matrice degli scontri diretti di un campionato da una sola query su pair_stats
+"""
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS pair_stats (
+        season TEXT,
+        league TEXT,
+        team_a TEXT,
+        team_b TEXT,
+        a_home_played INTEGER,
+        a_home_wins INTEGER,
+        a_home_draws INTEGER,
+        a_home_losses INTEGER,
+        a_home_gf INTEGER,
+        a_home_ga INTEGER,
+        b_home_played INTEGER,
+        b_home_wins INTEGER,
+        b_home_draws INTEGER,
+        b_home_losses INTEGER,
+        b_home_gf INTEGER,
+        b_home_ga INTEGER,
+        UNIQUE (season, league, team_a, team_b)
+    )
+'''
+
+# Ricalcolo di una stagione: team_a è la squadra con il nome minore, a_home = 1 se gioca in casa
+# Statistiche "b_home_*" dal punto di vista di team_b (in casa)
+REFRESH_SQL = '''
+    INSERT INTO pair_stats
+    SELECT ?, l.code, p.team_a, p.team_b,
+           SUM(p.a_home),
+           SUM(p.a_home * (p.a_goals > p.b_goals)),
+           SUM(p.a_home * (p.a_goals = p.b_goals)),
+           SUM(p.a_home * (p.a_goals < p.b_goals)),
+           SUM(p.a_home * p.a_goals),
+           SUM(p.a_home * p.b_goals),
+           SUM(1 - p.a_home),
+           SUM((1 - p.a_home) * (p.b_goals > p.a_goals)),
+           SUM((1 - p.a_home) * (p.b_goals = p.a_goals)),
+           SUM((1 - p.a_home) * (p.b_goals < p.a_goals)),
+           SUM((1 - p.a_home) * p.b_goals),
+           SUM((1 - p.a_home) * p.a_goals)
+    FROM (
+        SELECT m.league_id,
+               min(h.name, a.name) AS team_a,
+               max(h.name, a.name) AS team_b,
+               h.name < a.name AS a_home,
+               CASE WHEN h.name < a.name THEN m.fthg ELSE m.ftag END AS a_goals,
+               CASE WHEN h.name < a.name THEN m.ftag ELSE m.fthg END AS b_goals
+        FROM match_data m
+        JOIN teams h ON h.id = m.home_id
+        JOIN teams a ON a.id = m.away_id
+        WHERE m.season_id IS ?
+          AND m.fthg IS NOT NULL AND m.ftag IS NOT NULL
+    ) p
+    JOIN leagues l ON l.id = p.league_id
+    GROUP BY p.league_id, p.team_a, p.team_b
+'''
+
+STAT_COLUMNS = [
+    'a_home_played', 'a_home_wins', 'a_home_draws', 'a_home_losses', 'a_home_gf', 'a_home_ga',
+    'b_home_played', 'b_home_wins', 'b_home_draws', 'b_home_losses', 'b_home_gf', 'b_home_ga',
+]
+
+# Tutte le stagioni di una coppia (team_a < team_b)
+PAIR_STATS = f"""
+    SELECT season, league, {', '.join(STAT_COLUMNS)}
+    FROM pair_stats
+    WHERE team_a = ? AND team_b = ?
+    ORDER BY season DESC
+"""
+
+# Tutte le coppie di un campionato in una stagione (matrice)
+LEAGUE_PAIRS = f"""
+    SELECT team_a, team_b, {', '.join(STAT_COLUMNS)}
+    FROM pair_stats
+    WHERE league = ? AND season = ?
+"""
+
+# Squadre di un campionato in una stagione (menu a tendina)
+LEAGUE_TEAMS = "SELECT team FROM team_season_stats WHERE league = ? AND season = ? ORDER BY team"
+
+# Partite di una coppia dalla più recente: indice sulla coppia non ordinata di ogni partizione
+PAIR_MATCHES = """
+    SELECT s.name AS season, l.code AS div, m.date,
+           h.name AS home_team, a.name AS away_team, m.fthg, m.ftag
+    FROM match_data m
+    JOIN leagues l ON l.id = m.league_id
+    JOIN teams h ON h.id = m.home_id
+    JOIN teams a ON a.id = m.away_id
+    LEFT JOIN seasons s ON s.id = m.season_id
+    WHERE min(m.home_id, m.away_id) = ? AND max(m.home_id, m.away_id) = ?
+    ORDER BY m.date DESC
+    LIMIT ?
+"""
+
+TEAM_ID = "SELECT id FROM teams WHERE name = ?"
+
+SUMMARY_COLUMNS = [
+    'season', 'league', 'played', 'wins', 'draws', 'losses', 'gf', 'ga',
+    'home_played', 'home_wins', 'home_draws', 'home_losses',
+    'away_played', 'away_wins', 'away_draws', 'away_losses',
+]
+
+
+def refresh_season(conn, season, season_id):
+    """Inserisce le coppie di una stagione già svuotata (vedi storage.refresh_materialized)"""
+    conn.execute(REFRESH_SQL, (season, season_id))
+
+
+def _perspective(row, first):
+    """Statistiche di una riga di pair_stats dal punto di vista di team_a (first) o team_b"""
+    a = dict(zip(['played', 'wins', 'draws', 'losses', 'gf', 'ga'], row[:6]))
+    b = dict(zip(['played', 'wins', 'draws', 'losses', 'gf', 'ga'], row[6:]))
+    home, away = (a, b) if first else (b, a)
+    # In trasferta vittorie e sconfitte si scambiano rispetto a chi gioca in casa
+    return {
+        'played': home['played'] + away['played'],
+        'wins': home['wins'] + away['losses'],
+        'draws': home['draws'] + away['draws'],
+        'losses': home['losses'] + away['wins'],
+        'gf': home['gf'] + away['ga'],
+        'ga': home['ga'] + away['gf'],
+        'home_played': home['played'],
+        'home_wins': home['wins'],
+        'home_draws': home['draws'],
+        'home_losses': home['losses'],
+        'away_played': away['played'],
+        'away_wins': away['losses'],
+        'away_draws': away['draws'],
+        'away_losses': away['wins'],
+    }
+
+
+def pair_summary(conn, team, opponent):
+    """Scontri diretti di team contro opponent: {'seasons': [righe per stagione], 'total': totali}
+
+    Le statistiche sono dal punto di vista di team (vedi SUMMARY_COLUMNS).
+    """
+    first = team < opponent
+    team_a, team_b = (team, opponent) if first else (opponent, team)
+    seasons = []
+    for season, league, *stats in conn.execute(PAIR_STATS, (team_a, team_b)):
+        seasons.append({'season': season, 'league': league, **_perspective(stats, first)})
+
+    total = {col: sum(row[col] for row in seasons) for col in SUMMARY_COLUMNS[2:]}
+    return {'seasons': seasons, 'total': total}
+
+
+def pair_matches(conn, team, opponent, limit=20):
+    """Ultime partite tra due squadre (tutte le stagioni), dalla più recente"""
+    ids = []
+    for name in (team, opponent):
+        row = conn.execute(TEAM_ID, (name,)).fetchone()
+        if row is None:
+            return []
+        ids.append(row[0])
+    return conn.execute(PAIR_MATCHES, (min(ids), max(ids), limit)).fetchall()
+
+
+def head_to_head_matrix(conn, league, season, value='points'):
+    """Matrice squadre x squadre di un campionato: riga = squadra, colonna = avversaria
+
+    value: 'points' (punti ottenuti dalla squadra di riga) o 'gd' (differenza reti).
+    """
+    import numpy as np
+    import pandas as pd
+
+    rows = conn.execute(LEAGUE_PAIRS, (league, season)).fetchall()
+    if not rows:
+        return pd.DataFrame()
+
+    teams = sorted({r[0] for r in rows} | {r[1] for r in rows})
+    index = {team: i for i, team in enumerate(teams)}
+    a = np.array([index[r[0]] for r in rows])
+    b = np.array([index[r[1]] for r in rows])
+    stats = np.array([r[2:] for r in rows], dtype=np.float64)
+    ah = dict(zip(STAT_COLUMNS, stats.T))
+
+    # Dal punto di vista di team_a: partite in casa + partite in trasferta (casa di team_b)
+    a_wins = ah['a_home_wins'] + ah['b_home_losses']
+    b_wins = ah['a_home_losses'] + ah['b_home_wins']
+    draws = ah['a_home_draws'] + ah['b_home_draws']
+    a_goals = ah['a_home_gf'] + ah['b_home_ga']
+    b_goals = ah['a_home_ga'] + ah['b_home_gf']
+
+    if value == 'gd':
+        a_value, b_value = a_goals - b_goals, b_goals - a_goals
+    else:
+        a_value, b_value = a_wins * 3 + draws, b_wins * 3 + draws
+
+    matrix = np.full((len(teams), len(teams)), np.nan)
+    matrix[a, b] = a_value
+    matrix[b, a] = b_value
+    return pd.DataFrame(matrix, index=teams, columns=teams)
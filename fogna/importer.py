@@ -0,0 +1,155 @@
+"""
+Importazione da riga di comando di una cartella di workbook all-euro-data-YYYY-YYYY.xlsx
+- Stagione dal nome del file, stessa mappatura colonne del caricamento dall'app
+- Lettura in parallelo: un processo per file, o per foglio se i file sono meno dei processi
+- UNA sola connessione di scrittura, una transazione per file
+- I fogli invariati vengono saltati come nell'app (impronte SHA-256)
+
+Uso:
+    python -m fogna.importer CARTELLA [--db football_stats.db] [--overwrite] [--dry-run] [--workers N]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from fogna.ingest import extract_season_from_filename, iter_workbook, read_source
+from fogna.storage import DB_PATH, bulk_load, connect, create_schema, plan_ingest
+
+
+def discover(directory):
+    """File Excel della cartella con la stagione riconosciuta dal nome: [(percorso, stagione)]"""
+    found = []
+    for name in sorted(os.listdir(directory)):
+        if name.startswith('~$') or not name.lower().endswith(('.xlsx', '.xls')):
+            continue
+        found.append((os.path.join(directory, name), extract_season_from_filename(name)))
+    return found
+
+
+def _parse(path, season, sheets):
+    """Legge i fogli indicati (None = tutti) in un processo del pool: (blocchi, righe senza data)"""
+    undated = Counter()
+    chunks = list(iter_workbook(path, season, sheets=sheets, undated=undated))
+    return chunks, sum(undated.values())
+
+
+def _result(name, season, rows=0, skipped=(), error=None, warning=None, undated=0):
+    """Esito dell'importazione di un file"""
+    return {'file': name, 'season': season, 'rows': rows, 'skipped': list(skipped),
+            'error': error, 'warning': warning, 'undated': undated}
+
+
+def run(directory, db_path=DB_PATH, overwrite=False, dry_run=False, workers=None):
+    """Importa tutti i file della cartella; restituisce l'esito di ogni file (vedi _result)"""
+    if dry_run:
+        # In prova il database viene solo letto: niente PRAGMA di scrittura né migrazioni
+        if os.path.exists(db_path):
+            conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+        else:
+            conn = sqlite3.connect(':memory:')
+    else:
+        conn = connect(db_path)
+        create_schema(conn)
+
+    files = discover(directory)
+    workers = workers or os.cpu_count() or 1
+    # Un processo per foglio solo se i file non bastano a occupare tutti i processi:
+    # a ogni apertura openpyxl scorre tutti i fogli per calcolarne le dimensioni
+    per_sheet = len(files) < workers
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Tutti i file vanno subito nel pool, lo scrittore li consuma in ordine
+        pending = []
+        for path, season in files:
+            name = os.path.basename(path)
+            if not season:
+                results.append(_result(name, None, warning="stagione non riconosciuta dal nome"))
+                continue
+            try:
+                plan = plan_ingest(conn, read_source(path), season, overwrite)
+            except Exception as e:
+                results.append(_result(name, season, error=str(e)))
+                continue
+            if not plan['fingerprints']:
+                results.append(_result(name, season, skipped=plan['skipped']))
+                continue
+            if per_sheet and plan['sheets'] is not None:
+                tasks = [[sheet] for sheet in plan['sheets']]
+            else:
+                tasks = [plan['sheets']]
+            futures = [pool.submit(_parse, path, season, sheets) for sheets in tasks]
+            pending.append((name, season, plan, futures))
+
+        for name, season, plan, futures in pending:
+            try:
+                parsed = [future.result() for future in futures]
+                chunks = [chunk for part, _ in parsed for chunk in part]
+                undated = sum(count for _, count in parsed)
+                if dry_run:
+                    rows = sum(len(chunk) for chunk in chunks)
+                else:
+                    rows = bulk_load(
+                        conn, chunks, season=season, overwrite=overwrite,
+                        fingerprints=plan['fingerprints'],
+                    )
+            except Exception as e:
+                results.append(_result(name, season, error=str(e)))
+                continue
+            results.append(_result(name, season, rows, plan['skipped'], undated=undated))
+
+    conn.close()
+    return sorted(results, key=lambda r: r['file'])
+
+
+def main(argv=None):
+    """Entry point da riga di comando"""
+    parser = argparse.ArgumentParser(description="Importa una cartella di workbook FOGNA")
+    parser.add_argument('directory', help="cartella con i file all-euro-data-YYYY-YYYY.xlsx")
+    parser.add_argument('--db', default=DB_PATH, help=f"database di destinazione (default: {DB_PATH})")
+    parser.add_argument('--overwrite', action='store_true', help="sovrascrive le stagioni già caricate")
+    parser.add_argument('--dry-run', action='store_true', help="legge i file senza scrivere nel database")
+    parser.add_argument('--workers', type=int, default=None, help="processi di lettura (default: CPU)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        print(f"❌ Cartella non trovata: {args.directory}", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    results = run(args.directory, args.db, args.overwrite, args.dry_run, args.workers)
+    elapsed = time.perf_counter() - start
+
+    total = 0
+    errors = 0
+    for r in results:
+        if r['error']:
+            errors += 1
+            print(f"❌ {r['file']}: {r['error']}")
+        elif r['warning']:
+            print(f"⚠️ {r['file']}: {r['warning']}, saltato")
+        elif r['rows']:
+            total += r['rows']
+            note = f" ({len(r['skipped'])} fogli invariati)" if r['skipped'] else ""
+            if r['undated']:
+                note += f" ⚠️ {r['undated']} partite senza data scartate"
+            print(f"✅ {r['file']} [{r['season']}]: {r['rows']} righe{note}")
+        elif r['undated']:
+            print(f"⚠️ {r['file']} [{r['season']}]: nessuna partita con data valida "
+                  f"({r['undated']} senza data scartate)")
+        else:
+            print(f"⏭️ {r['file']} [{r['season']}]: nessun foglio modificato")
+
+    prefix = "🔍 Prova: " if args.dry_run else "📥 "
+    print(f"{prefix}{total} righe da {len(results)} file in {elapsed:.1f}s "
+          f"({total / elapsed:.0f} righe/s)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Lettura in streaming dei file Excel all-euro-data-YYYY-YYYY.xlsx
+- Il workbook viene aperto UNA sola volta in modalità read-only
+- Vengono lette solo le colonne di COL_MAP (le quote scommesse sono ignorate)
+- Le righe escono a blocchi di dimensione fissa, già con i tipi compatti
+- Impronte SHA-256 del file e di ogni foglio per saltare i fogli non modificati
+"""
+
+import hashlib
+import io
+import os
+import re
+import zipfile
+from xml.etree import ElementTree
+
+# Mappatura colonne Excel -> colonne della tabella matches
+COL_MAP = {
+    'HomeTeam': 'home_team', 'AwayTeam': 'away_team',
+    'FTHG': 'fthg', 'FTAG': 'ftag', 'FTR': 'ftr',
+    'HTHG': 'hthg', 'HTAG': 'htag', 'HTR': 'htr',
+    'HS': 'hs', 'AS': 'as_team', 'HST': 'hst', 'AST': 'ast',
+    'HF': 'hf', 'AF': 'af', 'HC': 'hc', 'AC': 'ac',
+    'HY': 'hy', 'AY': 'ay', 'HR': 'hr', 'AR': 'ar',
+    'Season': 'season', 'Div': 'div', 'Date': 'date', 'Time': 'time'
+}
+
+# Ordine fisso delle colonne di ogni blocco
+COLUMNS = [
+    'div', 'date', 'time', 'home_team', 'away_team',
+    'fthg', 'ftag', 'ftr', 'hthg', 'htag', 'htr',
+    'hs', 'as_team', 'hst', 'ast', 'hf', 'af', 'hc', 'ac',
+    'hy', 'ay', 'hr', 'ar', 'season'
+]
+
+INT_COLUMNS = [
+    'fthg', 'ftag', 'hthg', 'htag',
+    'hs', 'as_team', 'hst', 'ast', 'hf', 'af', 'hc', 'ac',
+    'hy', 'ay', 'hr', 'ar'
+]
+
+CATEGORY_COLUMNS = ['div', 'home_team', 'away_team', 'ftr', 'htr', 'season']
+
+# Righe per blocco passate al database
+CHUNK_SIZE = 5000
+
+
+def extract_season_from_filename(filename):
+    """Estrae automaticamente la stagione dal nome file"""
+    season_pattern = r'(\d{4})-(\d{4})'
+    match = re.search(season_pattern, filename)
+
+    if match:
+        year1 = int(match.group(1))
+        year2 = int(match.group(2))
+
+        if year2 == year1 + 1:
+            return f"{year1}-{year2}"
+    return None
+
+
+def read_source(source):
+    """Contenuto del file (percorso o file caricato) come bytes"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return f.read()
+    source.seek(0)
+    data = source.read()
+    source.seek(0)
+    return data
+
+
+def file_fingerprint(data):
+    """Impronta SHA-256 dell'intero file"""
+    return hashlib.sha256(data).hexdigest()
+
+
+_NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_NS_PKG = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def _shared_strings(archive):
+    """Tabella delle stringhe condivise di un .xlsx (indice -> testo)"""
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+    strings = []
+    with archive.open('xl/sharedStrings.xml') as f:
+        for _, elem in ElementTree.iterparse(f):
+            if elem.tag == f'{_NS_MAIN}si':
+                strings.append(''.join(t.text or '' for t in elem.iter(f'{_NS_MAIN}t')))
+                elem.clear()
+    return strings
+
+
+def _sheet_digest(archive, part, shared):
+    """SHA-256 dei valori delle celle di un foglio (stringhe condivise già risolte)"""
+    digest = hashlib.sha256()
+    with archive.open(part) as f:
+        for _, elem in ElementTree.iterparse(f):
+            if elem.tag != f'{_NS_MAIN}c':
+                continue
+            kind = elem.get('t') or ''
+            if kind == 'inlineStr':
+                value = ''.join(t.text or '' for t in elem.iter(f'{_NS_MAIN}t'))
+            else:
+                v = elem.find(f'{_NS_MAIN}v')
+                value = '' if v is None or v.text is None else v.text
+                if kind == 's':
+                    value = shared[int(value)]
+            digest.update(f"{elem.get('r')}\x1f{kind}\x1f{value}\x1e".encode())
+            elem.clear()
+    return digest.hexdigest()
+
+
+def sheet_fingerprints(data):
+    """Impronta di ogni foglio di un .xlsx: {nome foglio: sha256}
+
+    L'impronta copre i valori delle celle del foglio, con le stringhe condivise risolte:
+    una stringa nuova in un altro foglio non cambia l'impronta. Per i .xls restituisce {}.
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        return {}
+
+    with archive:
+        names = set(archive.namelist())
+        workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+        rels = ElementTree.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+        targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(f'{_NS_PKG}Relationship')}
+        shared = _shared_strings(archive)
+
+        fingerprints = {}
+        for sheet in workbook.iter(f'{_NS_MAIN}sheet'):
+            target = targets.get(sheet.get(f'{_NS_REL}id'), '')
+            part = target.lstrip('/') if target.startswith('/') else f'xl/{target}'
+            if part not in names:
+                continue
+            fingerprints[sheet.get('name')] = _sheet_digest(archive, part, shared)
+        return fingerprints
+
+
+def _is_empty(value):
+    """True se la cella è vuota (None, stringa vuota o NaN)"""
+    return value is None or value == '' or (isinstance(value, float) and value != value)
+
+
+def _build_chunk(records):
+    """Crea il DataFrame di un blocco riducendo i tipi (Int16 / category)
+
+    Le righe senza data (vuota o non leggibile) vengono scartate: la data fa parte della
+    chiave naturale della partita. Il numero di righe scartate è in df.attrs['undated'].
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(records, columns=COLUMNS)
+    df['date'] = pd.to_datetime(df['date'], errors='coerce', dayfirst=True)
+    undated = df['date'].isna()
+    if undated.any():
+        df = df[~undated].reset_index(drop=True)
+    for col in INT_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int16')
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype('category')
+    df.attrs['undated'] = int(undated.sum())
+    return df
+
+
+def _dated_chunk(block, sheet, undated):
+    """Blocco di un gruppo di righe, se ne resta almeno una con la data (mai blocchi vuoti)"""
+    chunk = _build_chunk(block)
+    if undated is not None and chunk.attrs['undated']:
+        undated[sheet] += chunk.attrs['undated']
+    if len(chunk):
+        yield chunk
+
+
+def _iter_rows(rows, sheet, season, chunk_size, undated=None):
+    """Proietta le righe di un foglio sulle colonne utili e le raggruppa a blocchi
+
+    undated (Counter), se indicato, riceve le righe senza data scartate del foglio.
+    """
+    header = next(rows, None)
+    if not header:
+        return
+
+    # Posizione nel foglio di ogni colonna utile (None se assente)
+    positions = {v: None for v in COLUMNS}
+    for i, name in enumerate(header):
+        if name in COL_MAP:
+            positions[COL_MAP[name]] = i
+    if positions['home_team'] is None or positions['away_team'] is None:
+        return
+
+    getters = [positions[c] for c in COLUMNS]
+    i_div = COLUMNS.index('div')
+    i_season = COLUMNS.index('season')
+    i_home = positions['home_team']
+    i_away = positions['away_team']
+
+    block = []
+    for row in rows:
+        if i_home >= len(row) or i_away >= len(row):
+            continue
+        if _is_empty(row[i_home]) or _is_empty(row[i_away]):
+            continue
+
+        record = [row[g] if g is not None and g < len(row) else None for g in getters]
+        if _is_empty(record[i_div]):
+            record[i_div] = sheet
+        record[i_season] = season
+        block.append(record)
+
+        if len(block) >= chunk_size:
+            yield from _dated_chunk(block, sheet, undated)
+            block = []
+
+    if block:
+        yield from _dated_chunk(block, sheet, undated)
+
+
+def _reported(chunks, sheet, progress):
+    """Passa i blocchi e chiama progress(foglio, righe, finito) dopo che sono stati consumati"""
+    for chunk in chunks:
+        yield chunk
+        if progress:
+            progress(sheet, len(chunk), False)
+    if progress:
+        progress(sheet, 0, True)
+
+
+def iter_workbook(source, season, chunk_size=CHUNK_SIZE, sheets=None, progress=None, undated=None):
+    """Legge i fogli del workbook (tutti o solo quelli in sheets) in un solo passaggio, a blocchi
+
+    progress(foglio, righe, finito), se indicato, viene chiamato dopo ogni blocco e a fine foglio.
+    undated (collections.Counter), se indicato, riceve per foglio le righe senza data scartate.
+    """
+    name = str(getattr(source, 'name', source)).lower()
+
+    if name.endswith('.xls'):
+        # Formato vecchio: openpyxl non lo legge, una sola lettura con pandas
+        import pandas as pd
+
+        frames = pd.read_excel(
+            source,
+            sheet_name=None if sheets is None else list(sheets),
+            usecols=lambda c: c in COL_MAP
+        )
+        for sheet, df in frames.items():
+            rows = iter([tuple(df.columns)] + list(df.itertuples(index=False, name=None)))
+            yield from _reported(_iter_rows(rows, sheet, season, chunk_size, undated), sheet, progress)
+        return
+
+    import openpyxl
+
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            if sheets is not None and ws.title not in sheets:
+                continue
+            chunks = _iter_rows(ws.iter_rows(values_only=True), ws.title, season, chunk_size, undated)
+            yield from _reported(chunks, ws.title, progress)
+    finally:
+        wb.close()
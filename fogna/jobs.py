@@ -0,0 +1,189 @@
+"""
+Caricamenti in background (📤 Carica File)
+- Ogni file caricato diventa un job nella tabella jobs e viene copiato in una cartella di coda
+- Un thread di lavoro esegue i job uno alla volta con la connessione di scrittura
+- Avanzamento per foglio e righe/secondo salvati nella tabella durante il caricamento
+- La tabella sta in un database separato: gli aggiornamenti di stato non aspettano
+  la transazione del caricamento sul database principale
+- Al riavvio i job rimasti in coda o interrotti vengono ripresi
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fogna.ingest import sheet_fingerprints
+from fogna.storage import ingest_workbook
+
+# Stati di un job
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY,
+        filename TEXT NOT NULL,
+        path TEXT NOT NULL,
+        season TEXT,
+        overwrite INTEGER NOT NULL DEFAULT 0,
+        status TEXT NOT NULL DEFAULT 'queued',
+        sheets_total INTEGER,
+        sheets_done INTEGER NOT NULL DEFAULT 0,
+        current_sheet TEXT,
+        rows INTEGER NOT NULL DEFAULT 0,
+        rows_per_sec REAL,
+        message TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        started_at TIMESTAMP,
+        finished_at TIMESTAMP
+    )
+'''
+
+JOB_COLUMNS = [
+    'id', 'filename', 'season', 'overwrite', 'status', 'sheets_total', 'sheets_done',
+    'current_sheet', 'rows', 'rows_per_sec', 'message', 'created_at', 'started_at', 'finished_at'
+]
+
+# Aggiornamenti di avanzamento al massimo ogni PROGRESS_INTERVAL secondi
+PROGRESS_INTERVAL = 0.5
+
+
+def jobs_path(db_path):
+    """Percorso del database dei job accanto al database principale"""
+    return os.path.splitext(db_path)[0] + '_jobs.db'
+
+
+class IngestWorker:
+    """Coda persistente dei caricamenti, eseguiti da un thread in background"""
+
+    def __init__(self, manager, spool_dir=None):
+        self.manager = manager
+        db_path = os.path.abspath(manager.path)
+        self.spool_dir = spool_dir or os.path.join(os.path.dirname(db_path), 'fogna_uploads')
+        os.makedirs(self.spool_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(jobs_path(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(SCHEMA)
+        self._lock = threading.Lock()
+        # Un solo thread: le scritture sul database sono comunque serializzate
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='fogna-ingest')
+
+        # Job interrotti da un riavvio: la loro transazione non è stata confermata
+        self._update("UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?", (QUEUED, RUNNING))
+        for (job_id,) in self._query("SELECT id FROM jobs WHERE status = ? ORDER BY id", (QUEUED,)):
+            self._executor.submit(self._run, job_id)
+
+    def _update(self, sql, params=()):
+        """Scrittura sulla tabella jobs"""
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def _query(self, sql, params=()):
+        """Lettura dalla tabella jobs"""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def submit(self, filename, data, season, overwrite=False):
+        """Mette in coda un file (contenuto in bytes) e restituisce l'id del job"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (filename, path, season, overwrite) VALUES (?, '', ?, ?)",
+                (filename, season, int(overwrite)),
+            )
+            job_id = cursor.lastrowid
+            path = os.path.join(self.spool_dir, f"{job_id}_{os.path.basename(filename)}")
+            with open(path, 'wb') as f:
+                f.write(data)
+            self._conn.execute("UPDATE jobs SET path = ? WHERE id = ?", (path, job_id))
+            self._conn.commit()
+
+        self._executor.submit(self._run, job_id)
+        return job_id
+
+    def _run(self, job_id):
+        """Esegue un job: legge il file dalla coda e lo carica con la connessione di scrittura"""
+        path, season, overwrite = self._query(
+            "SELECT path, season, overwrite FROM jobs WHERE id = ?", (job_id,)
+        )[0]
+        try:
+            self._ingest(job_id, path, season, overwrite)
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _ingest(self, job_id, path, season, overwrite):
+        """Caricamento con aggiornamento dell'avanzamento nella tabella jobs"""
+        try:
+            with open(path, 'rb') as f:
+                sheets_total = len(sheet_fingerprints(f.read())) or None
+        except Exception as e:
+            self._finish(job_id, FAILED, 0, 0, str(e))
+            return
+
+        start = time.perf_counter()
+        state = {'rows': 0, 'sheets_done': 0, 'last': 0.0}
+        self._update(
+            "UPDATE jobs SET status = ?, started_at = CURRENT_TIMESTAMP, sheets_total = ?, "
+            "sheets_done = 0, rows = 0, current_sheet = NULL WHERE id = ?",
+            (RUNNING, sheets_total, job_id),
+        )
+
+        def progress(sheet, rows, finished):
+            state['rows'] += rows
+            state['sheets_done'] += finished
+            now = time.perf_counter()
+            if finished or now - state['last'] >= PROGRESS_INTERVAL:
+                state['last'] = now
+                self._update(
+                    "UPDATE jobs SET current_sheet = ?, sheets_done = ?, rows = ?, rows_per_sec = ? "
+                    "WHERE id = ?",
+                    (sheet, state['sheets_done'], state['rows'],
+                     round(state['rows'] / max(now - start, 1e-9), 1), job_id),
+                )
+
+        try:
+            with self.manager.writer() as writer:
+                result = ingest_workbook(writer, path, season, bool(overwrite), progress=progress)
+        except Exception as e:
+            self._finish(job_id, FAILED, state['rows'], time.perf_counter() - start, str(e))
+            return
+
+        if result['rows'] > 0:
+            message = f"{len(result['loaded'])} fogli caricati"
+            if result['skipped']:
+                message += f", {len(result['skipped'])} invariati"
+        elif result['skipped'] and not result['loaded']:
+            message = "File già caricato: nessun foglio modificato"
+        else:
+            message = "Nessun dato valido trovato"
+        if result['undated']:
+            message += f" ({result['undated']} partite senza data scartate)"
+        self._finish(job_id, DONE, result['rows'], time.perf_counter() - start, message)
+
+    def _finish(self, job_id, status, rows, seconds, message):
+        """Stato finale del job"""
+        self._update(
+            "UPDATE jobs SET status = ?, rows = ?, rows_per_sec = ?, message = ?, current_sheet = NULL, "
+            "finished_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (status, rows, round(rows / seconds, 1) if seconds else None, message, job_id),
+        )
+
+    def jobs(self, limit=20):
+        """Ultimi job, dal più recente, come dizionari"""
+        rows = self._query(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs ORDER BY id DESC LIMIT ?", (limit,)
+        )
+        return [dict(zip(JOB_COLUMNS, row)) for row in rows]
+
+    def active(self):
+        """Numero di job in coda o in esecuzione"""
+        return self._query(
+            "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+        )[0][0]
+
@@ -0,0 +1,27 @@
+"""
+Pagine dell'app, una per modulo
+- Ogni modulo espone render(app) e viene importato solo quando la pagina viene aperta
+- Le dipendenze pesanti (pandas, numpy, openpyxl) si importano dentro le pagine che le usano
+"""
+
+import importlib
+
+# Voce del menu -> modulo della pagina
+PAGINE = {
+    "🏠 Home": "home",
+    "📤 Carica File": "carica",
+    "🏆 BEST Teams": "best_teams",
+    "📊 Classifiche": "classifiche",
+    "⚔️ Scontri Diretti": "scontri",
+    "🔎 Cerca Squadra": "cerca",
+    "🗂️ Gestione Dati": "gestione",
+}
+
+# ADMIN vede tutto, UTENTE vede solo statistiche
+PAGINE_ADMIN = list(PAGINE)
+PAGINE_UTENTE = ["🏠 Home", "🏆 BEST Teams", "📊 Classifiche", "⚔️ Scontri Diretti", "🔎 Cerca Squadra"]
+
+
+def render(page, app):
+    """Importa il modulo della pagina (al primo uso) e la disegna"""
+    importlib.import_module(f"fogna.pagine.{PAGINE[page]}").render(app)
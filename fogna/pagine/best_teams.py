@@ -0,0 +1,125 @@
+"""
+🏆 BEST Teams: squadre con percentuale di vittorie sopra la soglia
+- Aggregati letti una volta per insieme di stagioni, soglia e ordinamento in memoria
+- Si disegna solo la pagina visibile, ordinamento scelto dall'utente
+"""
+
+import streamlit as st
+
+from fogna import queries
+
+# Colonne ordinabili: etichetta -> colonna di fogna.rankings
+ORDINAMENTI = {
+    "V%": "win_pct",
+    "Pts": "points",
+    "Partite": "played",
+    "Vittorie": "wins",
+    "Squadra": "team",
+    "Campionato": "league",
+    "Stagione": "season",
+}
+
+
+def render(app):
+    """Disegna la pagina"""
+    from fogna.rankings import best_teams, rankings_order, team_rankings
+    
+    conn, cache, timings, page = app.conn, app.cache, app.timings, app.page
+    
+    st.markdown("# 🏆 BEST Teams")
+    
+    all_seasons = [s[0] for s in cache.fetchall(conn, queries.SEASONS)]
+    
+    if not all_seasons:
+        st.warning("⚠️ Nessuna stagione disponibile")
+        st.stop()
+    
+    # Layout migliorato: tutto su una riga
+    col1, col2, col3 = st.columns([3, 1, 1.5])
+    
+    with col1:
+        selected_seasons = st.multiselect(
+            "📅 Seleziona Stagioni:", 
+            all_seasons, 
+            default=[all_seasons[0]],  # Solo l'ultima stagione selezionata di default
+            help="Seleziona una o più stagioni da analizzare"
+        )
+    
+    with col2:
+        threshold = st.number_input("🎯 Soglia %:", 0, 100, 65, 1, help="Percentuale minima di vittorie")
+    
+    with col3:
+        st.write("")  # Spazio per allineare
+        mostra = st.button("🏆 MOSTRA BEST TEAMS", type="primary", use_container_width=True)
+    
+    # Indicatore stagioni selezionate
+    if selected_seasons:
+        st.info(f"📊 Analizzando **{len(selected_seasons)}** stagione/i: {', '.join(selected_seasons)}")
+    else:
+        st.warning("⚠️ Seleziona almeno una stagione!")
+    
+    # Una volta mostrati, i risultati seguono soglia e ordinamento finché le stagioni non cambiano
+    stagioni = tuple(sorted(selected_seasons))
+    if selected_seasons and mostra:
+        st.session_state.best_teams_stagioni = stagioni
+    if not selected_seasons or st.session_state.get("best_teams_stagioni") != stagioni:
+        return
+    
+    # Aggregati calcolati una volta per insieme di stagioni (in cache fino alla prossima scrittura)
+    with timings.section(page, "aggregati"):
+        per_season, across = cache.get(conn, ("rankings", stagioni), lambda c: team_rankings(c, stagioni))
+    
+    col1, col2, col3, col4 = st.columns([2, 2, 1.5, 1])
+    with col1:
+        aggregata = st.checkbox("🔗 Somma le stagioni selezionate", help="Una riga per squadra su tutte le stagioni")
+    with col2:
+        sort_label = st.selectbox("↕️ Ordina per:", list(ORDINAMENTI))
+    with col3:
+        descending = st.radio("Verso:", ["⬇️ Decrescente", "⬆️ Crescente"], horizontal=True) == "⬇️ Decrescente"
+    with col4:
+        page_size = st.selectbox("Righe per pagina:", [25, 50, 100], index=1)
+    
+    # Soglia e ordinamento in memoria: nessuna query
+    with timings.section(page, "filtro"):
+        df = best_teams(
+            across if aggregata else per_season,
+            threshold,
+            rankings_order(ORDINAMENTI[sort_label], descending),
+        )
+    
+    total = len(df)
+    if total == 0:
+        st.warning(f"Nessuna squadra con % >= {threshold}%")
+        return
+    
+    st.success(f"🎯 Trovate {total} squadre con percentuale >= {threshold}%")
+    
+    # Pagina corrente: torna alla prima quando cambia la vista
+    vista = (stagioni, threshold, aggregata, sort_label, descending, page_size)
+    if st.session_state.get("best_teams_vista") != vista:
+        st.session_state.best_teams_vista = vista
+        st.session_state.best_teams_pagina = 0
+    pagine = -(-total // page_size)
+    pagina = min(st.session_state.best_teams_pagina, pagine - 1)
+    offset = pagina * page_size
+    
+    # Solo la pagina visibile arriva a st.dataframe
+    with timings.section(page, "pandas"):
+        df = df.iloc[offset:offset + page_size].copy()
+        df.insert(0, 'Pos', range(offset + 1, offset + len(df) + 1))
+        df.columns = ['Pos', 'Squadra', 'Campionato', 'Stagione', 'P', 'V', 'N', 'P2', 'V%', 'Pts']
+    
+    # Mostra dataframe (senza column_config per evitare pyarrow)
+    with timings.section(page, "render"):
+        st.dataframe(df, hide_index=True)
+    
+    def vai(delta):
+        st.session_state.best_teams_pagina = pagina + delta
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.button("⬅️ Precedente", disabled=pagina == 0, on_click=vai, args=(-1,))
+    with col2:
+        st.caption(f"Pagina {pagina + 1} di {pagine} · righe {offset + 1}-{offset + len(df)} di {total}")
+    with col3:
+        st.button("Successiva ➡️", disabled=pagina + 1 >= pagine, on_click=vai, args=(1,))
@@ -0,0 +1,81 @@
+"""
+📤 Carica File (solo admin): i file vanno nella coda dei caricamenti in background
+"""
+
+import streamlit as st
+
+from fogna.ingest import extract_season_from_filename
+
+
+def render(app):
+    """Disegna la pagina"""
+    worker = app.worker
+    
+    if st.session_state.tipo_utente != "admin":
+        st.error("⛔ Accesso negato! Solo gli amministratori possono caricare file.")
+        st.stop()
+    
+    st.markdown("# 📤 Carica File Excel")
+    
+    st.info("""
+    **Istruzioni:**
+    1. Seleziona il file Excel
+    2. La stagione viene riconosciuta automaticamente dal nome
+    3. Formato nome: all-euro-data-YYYY-YYYY.xlsx
+    """)
+    
+    uploaded_files = st.file_uploader("Scegli file Excel", type=['xlsx', 'xls'], accept_multiple_files=True)
+    
+    if uploaded_files:
+        for uploaded_file in uploaded_files:
+            season = extract_season_from_filename(uploaded_file.name)
+            if season:
+                st.success(f"✅ File: {uploaded_file.name} → 🎯 Stagione: **{season}**")
+            else:
+                st.warning(f"⚠️ File: {uploaded_file.name} → stagione non riconosciuta")
+        
+        load_type = st.radio(
+            "Tipo caricamento:",
+            ["normal", "overwrite"],
+            format_func=lambda x: "📥 Carica Normalmente" if x == "normal" else "🔄 Sovrascrivi Stagione"
+        )
+        
+        if st.button("🚀 CARICA FILE", type="primary"):
+            # Il caricamento continua in background anche se la pagina viene ricaricata
+            for uploaded_file in uploaded_files:
+                worker.submit(
+                    uploaded_file.name,
+                    uploaded_file.getvalue(),
+                    extract_season_from_filename(uploaded_file.name),
+                    overwrite=(load_type == "overwrite"),
+                )
+            st.success(f"📋 {len(uploaded_files)} file in coda di caricamento")
+    
+    @st.fragment(run_every=2)
+    def mostra_caricamenti():
+        """Stato dei caricamenti, aggiornato ogni 2 secondi"""
+        st.markdown("### 📋 Caricamenti")
+        jobs = worker.jobs()
+        if not jobs:
+            st.info("Nessun caricamento")
+            return
+        
+        stati = {"queued": "⏳ In coda", "running": "⚙️ In corso", "done": "✅ Completato", "failed": "❌ Errore"}
+        for job in jobs:
+            titolo = f"{stati[job['status']]} - {job['filename']} ({job['season'] or 'stagione ?'})"
+            if job['status'] == "running":
+                totale = job['sheets_total'] or 1
+                st.progress(
+                    min(job['sheets_done'] / totale, 1.0),
+                    text=f"{titolo} · foglio {job['current_sheet'] or '...'} "
+                         f"({job['sheets_done']}/{job['sheets_total'] or '?'}) · "
+                         f"{job['rows']} righe · {job['rows_per_sec'] or 0:.0f} righe/s"
+                )
+            elif job['status'] == "done":
+                st.write(f"{titolo} · {job['rows']} righe · {job['rows_per_sec'] or 0:.0f} righe/s · {job['message']}")
+            elif job['status'] == "failed":
+                st.error(f"{titolo}: {job['message']}")
+            else:
+                st.write(titolo)
+    
+    mostra_caricamenti()
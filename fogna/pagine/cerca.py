@@ -0,0 +1,74 @@
+"""
+🔎 Cerca Squadra: qualsiasi grafia del nome porta alla squadra canonica
+- Ricerca sull'indice FTS5 trigram degli alias (fogna.teams), nessuna lettura delle partite
+- Stagioni dalla tabella aggregata, forma dalle sequenze della squadra
+- Admin: collega una grafia a una squadra (le squadre doppie vengono unite)
+"""
+
+import streamlit as st
+
+from fogna import teams
+
+
+def render(app):
+    """Disegna la pagina"""
+    import pandas as pd
+
+    from fogna.sequences import team_form
+    from fogna.storage import add_team_alias
+
+    db, conn, cache, timings, page = app.db, app.conn, app.cache, app.timings, app.page
+
+    st.markdown("# 🔎 Cerca Squadra")
+
+    testo = st.text_input("Nome squadra:", placeholder="es. Bayern Munchen, Man United, St Etienne")
+    if not testo.strip():
+        st.info("💡 Scrivi un nome: abbreviazioni, accenti ed errori di battitura vanno bene")
+        st.stop()
+
+    with timings.section(page, "ricerca"):
+        risultati = cache.get(conn, ("team_search", testo), lambda c: teams.search_teams(c, testo))
+    if not risultati:
+        st.warning("Nessuna squadra trovata")
+        st.stop()
+
+    df = pd.DataFrame(risultati, columns=['Squadra', 'Grafia trovata', 'Somiglianza'])
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+    squadra = st.selectbox("⚽ Squadra:", list(dict.fromkeys(r[0] for r in risultati)))
+
+    with timings.section(page, "squadra"):
+        stagioni = cache.fetchall(conn, teams.TEAM_SEASONS, (squadra,))
+        grafie = cache.fetchall(conn, teams.TEAM_ALIASES, (squadra,))
+        serie = cache.get(conn, ("team_form", squadra), lambda c: team_form(c, squadra))
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Stagioni", len({s[0] for s in stagioni}))
+    with col2:
+        st.metric("Partite", sum(s[2] for s in stagioni))
+    with col3:
+        st.metric("Punti", sum(s[8] for s in stagioni))
+    with col4:
+        st.metric("Ultime 5", serie['form'] or "-", f"{serie['points']} punti", delta_color="off")
+
+    st.caption("Grafie: " + " · ".join(f"{a}{' 🔗' if manual else ''}" for a, manual in grafie))
+
+    if stagioni:
+        st.markdown("### 📅 Stagioni")
+        df = pd.DataFrame(stagioni, columns=['Stagione', 'Campionato', 'G', 'V', 'N', 'P', 'GF', 'GS', 'Punti'])
+        st.dataframe(df, use_container_width=True, hide_index=True)
+
+    if st.session_state.tipo_utente == "admin":
+        with st.expander("🔗 Collega una grafia"):
+            st.caption(f"Un'altra grafia di {squadra}: se è già una squadra, le sue partite passano a {squadra}")
+            alias = st.text_input("Grafia:", key="alias_squadra")
+            if st.button("🔗 COLLEGA") and alias.strip():
+                try:
+                    with db.writer() as writer:
+                        ricalcolate = add_team_alias(writer, alias.strip(), squadra)
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+                else:
+                    st.success(f"✅ {alias.strip()} → {squadra} ({len(ricalcolate)} stagioni ricalcolate)")
+                    st.rerun()
@@ -0,0 +1,97 @@
+"""
+📊 Classifiche: classifica completa di un campionato in una stagione
+- Forma delle ultime 5 e serie di ogni squadra dalla tabella team_sequences
+"""
+
+import streamlit as st
+
+from fogna import queries
+
+
+def render(app):
+    """Disegna la pagina"""
+    from fogna.sequences import league_form, rolling_averages, team_form, team_sequence
+    from fogna.standings import league_standings
+    
+    conn, cache, timings, page = app.conn, app.cache, app.timings, app.page
+    
+    st.markdown("# 📊 Classifiche Campionati")
+    
+    leagues = [l[0] for l in cache.fetchall(conn, queries.LEAGUES)]
+    
+    if leagues:
+        selected_league = st.selectbox("🏟️ Campionato:", leagues)
+        
+        seasons = [s[0] for s in cache.fetchall(conn, queries.LEAGUE_SEASONS, (selected_league,))]
+        
+        if seasons:
+            selected_season = st.selectbox("📅 Stagione:", seasons)
+            
+            if st.button("📊 MOSTRA CLASSIFICA", type="primary"):
+                # Classifica completa casa + trasferta con scontri diretti
+                with timings.section(page, "classifica"):
+                    df = cache.get(
+                        conn,
+                        ("standings", selected_league, selected_season),
+                        lambda c: league_standings(c, selected_league, selected_season)
+                    ).copy()
+                
+                if len(df) > 0:
+                    with timings.section(page, "forma"):
+                        forma = cache.get(
+                            conn,
+                            ("form", selected_league, selected_season),
+                            lambda c: league_form(c, selected_league, selected_season)
+                        )
+                    
+                    with timings.section(page, "pandas"):
+                        df.insert(0, 'Pos', range(1, len(df) + 1))
+                        df['form'] = df['team'].map(dict(zip(forma['team'], forma['form'])))
+                        df.columns = ['Pos', 'Squadra', 'P', 'V', 'N', 'P2', 'GF', 'GS', 'DR', 'Pts', 'Forma']
+                    
+                    with timings.section(page, "render"):
+                        st.dataframe(df, use_container_width=True, hide_index=True)
+                else:
+                    st.warning("Nessun dato")
+            
+            st.markdown("### 📈 Forma e Serie")
+            forma = cache.get(
+                conn,
+                ("form", selected_league, selected_season),
+                lambda c: league_form(c, selected_league, selected_season)
+            )
+            
+            if len(forma) > 0:
+                squadra = st.selectbox("⚽ Squadra:", list(forma['team']))
+                
+                with timings.section(page, "serie"):
+                    serie = cache.get(conn, ("team_form", squadra), lambda c: team_form(c, squadra))
+                    medie = cache.get(
+                        conn,
+                        ("rolling", squadra),
+                        lambda c: rolling_averages(team_sequence(c, squadra))
+                    )
+                
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Ultime 5", serie['form'] or "-", f"{serie['points']} punti", delta_color="off")
+                with col2:
+                    st.metric("🔥 Serie vittorie", serie['win_streak'],
+                              f"record {serie['longest_win_streak']}", delta_color="off")
+                with col3:
+                    st.metric("🛡️ Imbattibilità", serie['unbeaten_streak'],
+                              f"record {serie['longest_unbeaten_streak']}", delta_color="off")
+                
+                if len(medie) > 0:
+                    # Tabella e non grafico: st.line_chart richiede pyarrow, bloccato dall'app
+                    st.caption("Medie mobili sulle ultime 5 partite (tutte le stagioni), dalle più recenti")
+                    ultime = medie.iloc[::-1].head(10)
+                    valori = ultime[['gf', 'ga', 'shots', 'shots_against', 'points']].round(2)
+                    tabella = valori.astype(object).where(valori.notna(), "-")
+                    tabella.insert(0, 'date', ultime['date'].dt.strftime('%Y-%m-%d'))
+                    tabella.columns = ['Data', 'Gol fatti', 'Gol subiti', 'Tiri', 'Tiri subiti', 'Punti']
+                    st.dataframe(tabella, use_container_width=True, hide_index=True)
+            else:
+                st.info("Nessuna partita giocata")
+    else:
+        st.warning("Nessun campionato disponibile")
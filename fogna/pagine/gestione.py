@@ -0,0 +1,124 @@
+"""
+🗂️ Gestione Dati (solo admin): file caricati, esportazione, eliminazione e diagnostica
+"""
+
+import os
+from datetime import datetime
+
+import streamlit as st
+
+from fogna import queries
+from fogna.export import export_csv_gz
+from fogna.storage import delete_season
+
+
+def render(app):
+    """Disegna la pagina"""
+    import pandas as pd
+    
+    db, conn, cache, timings, page = app.db, app.conn, app.cache, app.timings, app.page
+    
+    if st.session_state.tipo_utente != "admin":
+        st.error("⛔ Accesso negato! Solo gli amministratori possono gestire i dati.")
+        st.stop()
+    
+    st.markdown("# 🗂️ Gestione Dati")
+    
+    tab1, tab2, tab3, tab4 = st.tabs(["📁 File", "📥 Esporta", "🗑️ Elimina", "🩺 Diagnostica"])
+    
+    with tab1:
+        st.markdown("### 📁 File Caricati")
+        data = cache.fetchall(conn, queries.SEASON_COUNTS)
+        if data:
+            df = pd.DataFrame(data, columns=['Stagione', 'Partite'])
+            st.dataframe(df, use_container_width=True, hide_index=True)
+            st.info(f"📊 {len(data)} stagioni | {sum([d[1] for d in data])} partite")
+        else:
+            st.warning("Nessun file")
+    
+    with tab2:
+        st.markdown("### 📥 Esporta Dati")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            export_seasons = st.multiselect(
+                "📅 Stagioni:",
+                [s[0] for s in cache.fetchall(conn, queries.SEASONS)],
+                help="Vuoto = tutte le stagioni"
+            )
+        with col2:
+            export_leagues = st.multiselect(
+                "🏟️ Campionati:",
+                [l[0] for l in cache.fetchall(conn, queries.LEAGUES)],
+                help="Vuoto = tutti i campionati"
+            )
+        
+        filtra_date = st.checkbox("📆 Filtra per data")
+        date_from = date_to = None
+        if filtra_date:
+            col1, col2 = st.columns(2)
+            with col1:
+                date_from = st.date_input("Dal:")
+            with col2:
+                date_to = st.date_input("Al:")
+        
+        if st.button("📥 ESPORTA CSV", type="primary"):
+            # CSV compresso scritto a blocchi su file temporaneo
+            # Connessione riservata: i caricamenti in corso non la chiudono a metà lettura
+            with st.spinner("Esportazione..."), timings.section(page, "export"), db.dedicated_reader() as lettore:
+                path, rows = export_csv_gz(lettore, export_seasons, export_leagues, date_from, date_to)
+            with open(path, 'rb') as f:
+                st.download_button(
+                    f"⬇️ Scarica CSV ({rows} partite)",
+                    f,
+                    f"fogna_{datetime.now().strftime('%Y%m%d')}.csv.gz",
+                    "application/gzip"
+                )
+            os.remove(path)
+    
+    with tab3:
+        st.markdown("### 🗑️ Elimina Dati")
+        st.warning("⚠️ Operazione irreversibile!")
+        
+        seasons = [s[0] for s in cache.fetchall(conn, queries.SEASONS)]
+        
+        if seasons:
+            season_del = st.selectbox("Stagione da eliminare:", seasons)
+            if st.button("🗑️ ELIMINA", type="secondary"):
+                with db.writer() as writer:
+                    delete_season(writer, season_del)
+                st.success(f"✅ Stagione {season_del} eliminata!")
+                st.rerun()
+    
+    with tab4:
+        st.markdown("### 🩺 Diagnostica")
+        st.caption(f"Ultime {len(timings.entries())} misure (query SQL, pagine e sezioni) di tutte le sessioni")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Query misurate", len(timings.entries("query")))
+        with col2:
+            st.metric("Cache hit", cache.hits)
+        with col3:
+            st.metric("Cache miss", cache.misses)
+        
+        colonne = {'name': 'Nome', 'count': 'Esecuzioni', 'mean_ms': 'Media ms', 'max_ms': 'Max ms', 'rows': 'Righe'}
+        
+        st.markdown("#### 🐢 Pagine più lente")
+        pagine_lente = timings.slowest("page") + timings.slowest("section")
+        if pagine_lente:
+            df = pd.DataFrame(pagine_lente).rename(columns=colonne).drop(columns=['Righe'])
+            st.dataframe(df.sort_values('Max ms', ascending=False), use_container_width=True, hide_index=True)
+        else:
+            st.info("Nessuna pagina misurata")
+        
+        st.markdown("#### 🐢 Query più lente")
+        query_lente = timings.slowest("query")
+        if query_lente:
+            st.dataframe(pd.DataFrame(query_lente).rename(columns=colonne), use_container_width=True, hide_index=True)
+        else:
+            st.info("Nessuna query misurata")
+        
+        if st.button("🧹 Svuota misure"):
+            timings.clear()
+            st.rerun()
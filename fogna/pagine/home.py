@@ -0,0 +1,45 @@
+"""
+🏠 Home: metriche generali e stagioni disponibili
+- Solo query scalari dalla cache: nessun import di pandas
+"""
+
+import streamlit as st
+
+from fogna import queries
+
+
+def render(app):
+    """Disegna la pagina"""
+    conn, cache = app.conn, app.cache
+    
+    st.markdown("# ⚽ FOGNA - Statistiche Calcio")
+    st.markdown("### Benvenuto nel Sistema di Statistiche Calcistiche!")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        total = cache.fetchone(conn, queries.COUNT_MATCHES)[0]
+        st.metric("Partite Totali", total)
+    
+    with col2:
+        seasons = cache.fetchone(conn, queries.COUNT_SEASONS)[0]
+        st.metric("Stagioni", seasons)
+    
+    with col3:
+        leagues = cache.fetchone(conn, queries.COUNT_LEAGUES)[0]
+        st.metric("Campionati", leagues)
+    
+    with col4:
+        teams = cache.fetchone(conn, queries.COUNT_TEAMS)[0]
+        st.metric("Squadre", teams)
+    
+    st.markdown("---")
+    st.markdown("### 📅 Stagioni Disponibili")
+    seasons_list = [s[0] for s in cache.fetchall(conn, queries.SEASONS)]
+    
+    if seasons_list:
+        st.success(f"🎯 Stagioni: {', '.join(seasons_list)}")
+    else:
+        st.warning("⚠️ Nessuna stagione caricata.")
+        if st.session_state.tipo_utente == "admin":
+            st.info("💡 Vai su 'Carica File' per aggiungere dati!")
@@ -0,0 +1,71 @@
+"""
+🔐 Login con livelli di accesso (👑 Amministratore / 👤 Utente)
+"""
+
+import streamlit as st
+
+
+def verifica_login(credenziali):
+    """Gestisce il sistema di login con livelli di accesso"""
+    
+    # Inizializza lo stato della sessione
+    if "autenticato" not in st.session_state:
+        st.session_state.autenticato = False
+        st.session_state.tipo_utente = None
+        st.session_state.nome_utente = None
+    
+    # Se già autenticato, permetti l'accesso
+    if st.session_state.autenticato:
+        return True
+    
+    # Altrimenti mostra schermata di login
+    st.markdown("""
+    <div style='text-align: center; padding: 50px;'>
+        <h1>⚽ FOGNA</h1>
+        <h3>Sistema Statistiche Calcistiche</h3>
+        <p style='color: #666;'>🔒 Accesso Riservato</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Form di login centrato
+    col1, col2, col3 = st.columns([1, 2, 1])
+    
+    with col2:
+        st.markdown("### 🔐 Login")
+        
+        tipo_login = st.radio(
+            "Tipo di accesso:",
+            ["👑 Amministratore", "👤 Utente"],
+            horizontal=True
+        )
+        
+        # Determina tipo utente
+        tipo = "admin" if "Amministratore" in tipo_login else "utente"
+        
+        password_inserita = st.text_input(
+            "Password:",
+            type="password",
+            placeholder="Inserisci la password...",
+            key="password_input"
+        )
+        
+        col_a, col_b, col_c = st.columns([1, 2, 1])
+        with col_b:
+            if st.button("🔓 ACCEDI", type="primary", use_container_width=True):
+                if password_inserita == credenziali[tipo]["password"]:
+                    st.session_state.autenticato = True
+                    st.session_state.tipo_utente = tipo
+                    st.session_state.nome_utente = credenziali[tipo]["ruolo"]
+                    st.success(f"✅ Benvenuto {credenziali[tipo]['icona']} {credenziali[tipo]['ruolo']}!")
+                    st.rerun()
+                else:
+                    st.error("❌ Password errata! Riprova.")
+        
+        st.markdown("---")
+        st.info("""
+        💡 **Livelli di accesso:**
+        - 👑 **Amministratore**: Accesso completo (visualizza + modifica)
+        - 👤 **Utente**: Solo visualizzazione statistiche
+        """)
+    
+    return False
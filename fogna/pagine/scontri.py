@@ -0,0 +1,87 @@
+"""
+⚔️ Scontri Diretti: bilancio tra due squadre e matrice di un campionato
+- Bilancio e partite dalla tabella pair_stats e dall'indice sulle coppie (fogna.head_to_head)
+"""
+
+import streamlit as st
+
+from fogna import queries
+from fogna.head_to_head import LEAGUE_TEAMS
+
+
+def render(app):
+    """Disegna la pagina"""
+    import pandas as pd
+
+    from fogna.head_to_head import head_to_head_matrix, pair_matches, pair_summary
+
+    conn, cache, timings, page = app.conn, app.cache, app.timings, app.page
+
+    st.markdown("# ⚔️ Scontri Diretti")
+
+    leagues = [l[0] for l in cache.fetchall(conn, queries.LEAGUES)]
+    if not leagues:
+        st.warning("Nessun campionato disponibile")
+        st.stop()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        league = st.selectbox("🏟️ Campionato:", leagues)
+    seasons = [s[0] for s in cache.fetchall(conn, queries.LEAGUE_SEASONS, (league,))]
+    with col2:
+        season = st.selectbox("📅 Stagione:", seasons)
+
+    teams = [t[0] for t in cache.fetchall(conn, LEAGUE_TEAMS, (league, season))]
+    if len(teams) < 2:
+        st.warning("Servono almeno due squadre")
+        st.stop()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        team = st.selectbox("🏠 Squadra:", teams, index=0)
+    with col2:
+        opponent = st.selectbox("🆚 Avversaria:", [t for t in teams if t != team])
+
+    # Bilancio su tutte le stagioni, dal punto di vista della prima squadra
+    with timings.section(page, "bilancio"):
+        summary = cache.get(conn, ("h2h", team, opponent), lambda c: pair_summary(c, team, opponent))
+        matches = cache.get(conn, ("h2h_matches", team, opponent), lambda c: pair_matches(c, team, opponent))
+
+    total = summary['total']
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Partite", total['played'])
+    with col2:
+        st.metric(f"Vittorie {team}", total['wins'])
+    with col3:
+        st.metric("Pareggi", total['draws'])
+    with col4:
+        st.metric(f"Vittorie {opponent}", total['losses'])
+    st.caption(
+        f"Gol {total['gf']}-{total['ga']} · "
+        f"in casa {total['home_wins']}V {total['home_draws']}N {total['home_losses']}P · "
+        f"in trasferta {total['away_wins']}V {total['away_draws']}N {total['away_losses']}P"
+    )
+
+    if summary['seasons']:
+        st.markdown("### 📅 Per Stagione")
+        df = pd.DataFrame(summary['seasons'])[['season', 'league', 'played', 'wins', 'draws', 'losses', 'gf', 'ga']]
+        df.columns = ['Stagione', 'Campionato', 'P', 'V', 'N', 'P2', 'GF', 'GS']
+        st.dataframe(df, use_container_width=True, hide_index=True)
+
+    if matches:
+        st.markdown("### 🗓️ Ultime Partite")
+        df = pd.DataFrame(matches, columns=['Stagione', 'Campionato', 'Data', 'Casa', 'Trasferta', 'GC', 'GT'])
+        st.dataframe(df, use_container_width=True, hide_index=True)
+
+    st.markdown(f"### 🧮 Matrice {league} {season}")
+    valore = st.radio("Valore:", ["Punti", "Differenza reti"], horizontal=True)
+    with timings.section(page, "matrice"):
+        key = 'gd' if valore == "Differenza reti" else 'points'
+        matrix = cache.get(
+            conn,
+            ("h2h_matrix", league, season, key),
+            lambda c: head_to_head_matrix(c, league, season, key)
+        )
+    st.caption("Riga = squadra, colonna = avversaria (andata + ritorno)")
+    st.dataframe(matrix, use_container_width=True)
@@ -0,0 +1,304 @@
+"""
+Query SQL delle pagine e controllo dei piani di esecuzione
+- Ogni pagina usa le query definite qui
+- check_query_plans() esegue EXPLAIN QUERY PLAN e segnala le scansioni complete
+- I piani dipendono dalle statistiche di ANALYZE (sqlite_stat1): su tabelle piccole SQLite
+  preferisce le scansioni, quindi il controllo da riga di comando pianifica sempre su uno
+  schema in memoria senza statistiche (copiato dal database indicato)
+
+Uso da riga di comando:
+    python -m fogna.queries [percorso_db]
+"""
+
+import os
+import re
+import sqlite3
+import sys
+
+from fogna import aggregates, head_to_head, sequences, teams
+
+# Generazione dei dati (chiave della cache, letta a ogni rerun)
+GENERATION = "SELECT value FROM meta WHERE key = ?"
+
+# HOME (dalla tabella aggregata: ogni partita conta una volta come "casa")
+COUNT_MATCHES = "SELECT COALESCE(SUM(home_played), 0) FROM team_season_stats"
+COUNT_SEASONS = "SELECT COUNT(DISTINCT season) FROM team_season_stats WHERE season IS NOT NULL"
+COUNT_LEAGUES = "SELECT COUNT(DISTINCT league) FROM team_season_stats"
+COUNT_TEAMS = "SELECT COUNT(DISTINCT team) FROM team_season_stats"
+
+# Menu a tendina
+SEASONS = "SELECT DISTINCT season FROM team_season_stats WHERE season IS NOT NULL ORDER BY season DESC"
+LEAGUES = "SELECT DISTINCT league FROM team_season_stats ORDER BY league"
+LEAGUE_SEASONS = "SELECT DISTINCT season FROM team_season_stats WHERE league = ? ORDER BY season DESC"
+
+# Id di una stagione: le query su match_data ricevono l'id come parametro, così
+# SQLite legge solo la partizione di quella stagione (vedi storage.sync_partition_view)
+SEASON_ID = "SELECT id FROM seasons WHERE name = ?"
+LEAGUE_ID = "SELECT id FROM leagues WHERE code = ?"
+
+# CLASSIFICHE (partite giocate, elaborate da fogna.standings)
+# Lettura diretta di match_data: filtri sugli id interi, nomi aggiunti per chiave primaria
+LEAGUE_MATCHES = """
+    SELECT h.name AS home_team, a.name AS away_team, m.fthg, m.ftag
+    FROM match_data m
+    JOIN teams h ON h.id = m.home_id
+    JOIN teams a ON a.id = m.away_id
+    WHERE m.league_id = (SELECT id FROM leagues WHERE code = ?)
+      AND m.season_id = ?
+      AND m.fthg IS NOT NULL AND m.ftag IS NOT NULL
+"""
+SEASON_MATCHES = """
+    SELECT l.code AS div, h.name AS home_team, a.name AS away_team, m.fthg, m.ftag
+    FROM match_data m
+    JOIN leagues l ON l.id = m.league_id
+    JOIN teams h ON h.id = m.home_id
+    JOIN teams a ON a.id = m.away_id
+    WHERE m.season_id = ?
+      AND m.fthg IS NOT NULL AND m.ftag IS NOT NULL
+"""
+
+# GESTIONE DATI
+SEASON_COUNTS = """
+    SELECT season, SUM(home_played) as num
+    FROM team_season_stats
+    WHERE season IS NOT NULL
+    GROUP BY season
+    ORDER BY season DESC
+"""
+EXPORT_ALL = "SELECT * FROM matches"
+
+# Esportazione filtrata: stesse colonne della vista matches, filtri sugli id e sulla data
+EXPORT_COLUMNS = [
+    'id', 'div', 'date', 'time', 'home_team', 'away_team',
+    'fthg', 'ftag', 'ftr', 'hthg', 'htag', 'htr',
+    'hs', 'as_team', 'hst', 'ast', 'hf', 'af', 'hc', 'ac',
+    'hy', 'ay', 'hr', 'ar', 'season', 'created_at'
+]
+
+# Impronte dei file caricati (📤 Carica File)
+FINGERPRINTS = "SELECT sheet, sha256 FROM file_fingerprints WHERE season = ?"
+DELETE_FINGERPRINTS = "DELETE FROM file_fingerprints WHERE season = ?"
+
+
+def season_id(conn, season):
+    """Id di una stagione (None se non è mai stata caricata)"""
+    row = conn.execute(SEASON_ID, (season,)).fetchone()
+    return row[0] if row else None
+
+
+def season_ids(conn, seasons):
+    """Id delle stagioni indicate (le stagioni sconosciute vengono ignorate)"""
+    ids = (season_id(conn, season) for season in seasons)
+    return [i for i in ids if i is not None]
+
+
+def league_ids(conn, leagues):
+    """Id dei campionati indicati (i codici sconosciuti vengono ignorati)"""
+    rows = (conn.execute(LEAGUE_ID, (league,)).fetchone() for league in leagues)
+    return [row[0] for row in rows if row is not None]
+
+
+def export_query(season_ids=None, league_ids=None, date_from=None, date_to=None):
+    """Query di esportazione con filtri opzionali: (sql, params)
+
+    season_ids, league_ids: id di stagioni e campionati (vedi season_ids() e league_ids());
+    lista vuota = nessuna partita.
+    """
+    where = []
+    params = []
+    if season_ids is not None:
+        where.append(f"m.season_id IN ({', '.join('?' for _ in season_ids)})")
+        params.extend(season_ids)
+    if league_ids is not None:
+        where.append(f"m.league_id IN ({', '.join('?' for _ in league_ids)})")
+        params.extend(league_ids)
+    if date_from:
+        where.append("m.date >= ?")
+        params.append(str(date_from))
+    if date_to:
+        where.append("m.date <= ?")
+        params.append(str(date_to))
+
+    sql = """
+    SELECT m.id, l.code, m.date, m.time, h.name, a.name,
+           m.fthg, m.ftag, m.ftr, m.hthg, m.htag, m.htr,
+           m.hs, m.as_team, m.hst, m.ast, m.hf, m.af, m.hc, m.ac,
+           m.hy, m.ay, m.hr, m.ar, s.name, m.created_at
+    FROM match_data m
+    CROSS JOIN leagues l ON l.id = m.league_id
+    JOIN teams h ON h.id = m.home_id
+    JOIN teams a ON a.id = m.away_id
+    LEFT JOIN seasons s ON s.id = m.season_id
+    """
+    # CROSS JOIN: match_data resta il ciclo esterno e usa i propri indici (data, campionato)
+    # invece di scorrere leagues e cercare ogni campionato nell'indice delle partite
+    if where:
+        sql += "WHERE " + " AND ".join(where)
+    return sql, tuple(params)
+
+
+def team_stats_query(seasons):
+    """Somme casa + trasferta per squadra e stagione (BEST Teams): (sql, params)"""
+    placeholders = ", ".join("?" * len(seasons))
+    sql = f"""
+    SELECT team, league, season,
+           home_played + away_played,
+           home_wins + away_wins,
+           home_draws + away_draws,
+           home_losses + away_losses,
+           home_points + away_points
+    FROM team_season_stats
+    WHERE season IN ({placeholders})
+    """
+    return sql, tuple(seasons)
+
+
+# Query di ogni pagina con parametri di esempio: (sql, params, scansione_ammessa)
+PAGE_QUERIES = {
+    "Tutte le pagine": [
+        (GENERATION, ("data_generation",), False),
+    ],
+    "🏠 Home": [
+        # Somma su tutta la tabella aggregata (una riga per squadra, non per partita)
+        (COUNT_MATCHES, (), True),
+        (COUNT_SEASONS, (), False),
+        (COUNT_LEAGUES, (), False),
+        (COUNT_TEAMS, (), False),
+        (SEASONS, (), False),
+    ],
+    "📤 Carica File": [
+        (FINGERPRINTS, ("2023-2024",), False),
+        (SEASON_ID, ("2023-2024",), False),
+        # Legge per intero la sola partizione della stagione
+        (aggregates.REFRESH_SQL, ("2023-2024", 1, 1), True),
+        (sequences.SEASON_SIDES, (1,), True),
+        (head_to_head.REFRESH_SQL, ("2023-2024", 1), True),
+    ],
+    "🏆 BEST Teams": [
+        (SEASONS, (), False),
+        (*team_stats_query(["2023-2024", "2024-2025"]), False),
+    ],
+    "📊 Classifiche": [
+        (LEAGUES, (), False),
+        (LEAGUE_SEASONS, ("E0",), False),
+        (SEASON_ID, ("2023-2024",), False),
+        (LEAGUE_MATCHES, ("E0", 1), False),
+        # Tutte le partite di una stagione = l'intera partizione di quella stagione
+        (SEASON_MATCHES, (1,), True),
+        (sequences.LEAGUE_SEQUENCES, ("E0", "2023-2024"), False),
+        (sequences.TEAM_SEQUENCES, ("Team A",), False),
+    ],
+    "⚔️ Scontri Diretti": [
+        (LEAGUES, (), False),
+        (LEAGUE_SEASONS, ("E0",), False),
+        (head_to_head.LEAGUE_TEAMS, ("E0", "2023-2024"), False),
+        (head_to_head.PAIR_STATS, ("Arsenal", "Chelsea"), False),
+        (head_to_head.TEAM_ID, ("Arsenal",), False),
+        (head_to_head.PAIR_MATCHES, (1, 2, 20), False),
+        (head_to_head.LEAGUE_PAIRS, ("E0", "2023-2024"), False),
+    ],
+    "🔎 Cerca Squadra": [
+        (teams.RESOLVE, ("man united",), False),
+        (teams.PREFIX_SEARCH, ("ma", "ma\uffff", teams.CANDIDATES), False),
+        (teams.TRIGRAM_SEARCH, ('"man" OR "uni"', teams.CANDIDATES), False),
+        (teams.TEAM_ALIASES, ("Man United",), False),
+        (teams.TEAM_SEASONS, ("Man United",), False),
+        (sequences.TEAM_SEQUENCES, ("Man United",), False),
+    ],
+    "🗂️ Gestione Dati": [
+        (SEASON_COUNTS, (), False),
+        (SEASONS, (), False),
+        (DELETE_FINGERPRINTS, ("2023-2024",), False),
+        # L'esportazione senza filtri legge per forza tutta la tabella
+        (EXPORT_ALL, (), True),
+        # Con un filtro sulla stagione si legge solo la sua partizione
+        (*export_query(season_ids=[1]), True),
+        (*export_query(league_ids=[1, 2]), False),
+        (*export_query(date_from="2024-01-01", date_to="2024-01-31"), False),
+    ],
+}
+
+# "SCAN m" senza "USING ... INDEX" = lettura completa (il piano riporta l'alias, non la tabella)
+# (una ricerca FTS5 appare come "SCAN ... VIRTUAL TABLE INDEX": usa l'indice full-text)
+_SCAN = re.compile(r'^SCAN (\S+)( USING .*INDEX| VIRTUAL TABLE INDEX)?')
+
+# Risultati intermedi già calcolati: "SCAN (subquery-N)", "SCAN CONSTANT ROW", CTE e co-routine
+_INTERMEDIATE = re.compile(r'^(?:MATERIALIZE|CO-ROUTINE) (\S+)')
+
+
+def check_query_plans(conn):
+    """Restituisce le query che fanno una scansione completa di una tabella"""
+    failures = []
+    for page, queries in PAGE_QUERIES.items():
+        for sql, params, scan_ok in queries:
+            if scan_ok:
+                continue
+            plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+            intermediate = {m.group(1) for m in map(_INTERMEDIATE.match, plan) if m}
+            scans = []
+            for step in plan:
+                match = _SCAN.match(step)
+                if not match or match.group(2) or step.startswith(('SCAN (', 'SCAN CONSTANT ROW')):
+                    continue
+                if match.group(1) not in intermediate:
+                    scans.append(step)
+            if scans:
+                failures.append((page, sql.strip(), scans))
+    return failures
+
+
+def copy_schema(path):
+    """Database in memoria con tabelle, indici e viste del database indicato (senza dati né statistiche)
+
+    Il database viene aperto in sola lettura. Le tabelle interne delle tabelle virtuali (FTS5)
+    le ricrea la tabella virtuale stessa.
+    """
+    source = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+    try:
+        rows = source.execute(
+            "SELECT type, name, sql FROM sqlite_master "
+            "WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' ORDER BY rowid"
+        ).fetchall()
+    finally:
+        source.close()
+
+    virtual = [name for _, name, sql in rows if sql.upper().startswith('CREATE VIRTUAL TABLE')]
+    conn = sqlite3.connect(':memory:')
+    # Le viste possono precedere le tabelle che usano (partizioni create dopo): prima le tabelle
+    for kind in ('table', 'index', 'view', 'trigger'):
+        for type_, name, sql in rows:
+            if type_ == kind and not any(name.startswith(f"{v}_") for v in virtual):
+                conn.execute(sql)
+    return conn
+
+
+def main(argv=None):
+    """Controllo da riga di comando: esce con codice 1 se trova scansioni complete
+
+    Senza argomenti usa uno schema vuoto in memoria con una partizione (la vista match_data
+    ha almeno un ramo). Di un database indicato si controlla lo schema, copiato in memoria:
+    le sue statistiche di ANALYZE non entrano nei piani.
+    """
+    from fogna.storage import create_partition, create_schema, sync_partition_view
+
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        conn = copy_schema(argv[0])
+    else:
+        conn = sqlite3.connect(':memory:')
+        create_schema(conn)
+        conn.execute("INSERT INTO seasons (id, name) VALUES (1, '2023-2024')")
+        create_partition(conn, 1)
+        sync_partition_view(conn)
+
+    failures = check_query_plans(conn)
+    for page, sql, scans in failures:
+        print(f"❌ {page}: {' | '.join(scans)}\n{sql}\n")
+    if failures:
+        return 1
+    print("✅ Nessuna scansione completa")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+BEST Teams calcolati una volta per insieme di stagioni (🏆 BEST Teams)
+- Una sola query con parametri su team_season_stats, risultato tenuto in cache
+- Nello stesso passaggio NumPy: una riga per squadra e stagione + una riga per squadra su tutte le stagioni
+- Soglia, ordinamento e pagina applicati in memoria: cambiare la soglia non rilegge il database
+"""
+
+import numpy as np
+import pandas as pd
+
+from fogna import queries
+
+RANKING_COLUMNS = ["team", "league", "season", "played", "wins", "draws", "losses", "win_pct", "points"]
+
+# Ordinamento predefinito; league e season rendono la chiave unica
+DEFAULT_ORDER = [
+    ("win_pct", True), ("points", True), ("played", True),
+    ("team", False), ("league", False), ("season", False),
+]
+
+_SUMS = ["played", "wins", "draws", "losses", "points"]
+
+
+def _win_pct(wins, played):
+    """Percentuale di vittorie arrotondata a un decimale
+
+    Metà arrotondate per eccesso come ROUND di SQLite (np.round le porta al pari: 9/16 = 56.2).
+    """
+    return np.floor(wins / np.maximum(played, 1) * 100 * 10 + 0.5) / 10
+
+
+def compute_rankings(rows):
+    """Da righe (team, league, season, played, wins, draws, losses, points) a (per stagione, aggregata)"""
+    names = ["team", "league", "season"] + _SUMS
+    per_season = pd.DataFrame(rows, columns=names)
+    for col in _SUMS:
+        per_season[col] = per_season[col].astype(np.int64)
+    per_season["win_pct"] = _win_pct(per_season["wins"].to_numpy(), per_season["played"].to_numpy())
+
+    # Stagioni in ordine crescente: l'ultima riga di ogni squadra è la stagione più recente
+    per_season = per_season.sort_values("season", kind="stable", ignore_index=True)
+    codes, teams = pd.factorize(per_season["team"])
+    n = len(teams)
+
+    across = pd.DataFrame({"team": teams})
+    for col in _SUMS:
+        across[col] = np.bincount(codes, weights=per_season[col].to_numpy(), minlength=n).astype(np.int64)
+    across["win_pct"] = _win_pct(across["wins"].to_numpy(), across["played"].to_numpy())
+
+    # Campionato della stagione più recente, stagioni come "prima → ultima (n)"
+    index = np.arange(len(codes))
+    first = np.full(n, len(codes))
+    np.minimum.at(first, codes, index)
+    last = np.zeros(n, dtype=np.int64)
+    np.maximum.at(last, codes, index)
+    count = np.bincount(codes, minlength=n)
+    seasons = per_season["season"].to_numpy()
+    across["league"] = per_season["league"].to_numpy()[last]
+    across["season"] = [
+        s1 if c == 1 else f"{s1} → {s2} ({c})"
+        for s1, s2, c in zip(seasons[first], seasons[last], count)
+    ]
+
+    return per_season[RANKING_COLUMNS], across[RANKING_COLUMNS]
+
+
+def team_rankings(conn, seasons):
+    """Statistiche BEST Teams delle stagioni indicate: (per stagione, aggregata)"""
+    return compute_rankings(conn.execute(*queries.team_stats_query(seasons)).fetchall())
+
+
+def rankings_order(sort="win_pct", descending=True):
+    """Chiave di ordinamento completa: la colonna scelta, poi l'ordine predefinito"""
+    return [(sort, descending)] + [(col, desc) for col, desc in DEFAULT_ORDER if col != sort]
+
+
+def best_teams(table, threshold, order=None):
+    """Righe con percentuale >= threshold, ordinate secondo order"""
+    order = order or DEFAULT_ORDER
+    selected = table[table["win_pct"] >= threshold]
+    return selected.sort_values(
+        [col for col, _ in order],
+        ascending=[not desc for _, desc in order],
+        kind="stable",
+        ignore_index=True,
+    )
@@ -0,0 +1,297 @@
+"""
+Sequenze partita per partita di ogni squadra (forma, serie, medie mobili)
+- Tabella team_sequences: una riga per squadra/campionato/stagione con array NumPy compatti
+  (BLOB) in ordine di data: risultati, gol e tiri
+- Aggiornata insieme a team_season_stats per le sole stagioni toccate
+- Forma delle ultime N, serie più lunghe e attuali calcolate in blocco su una matrice
+  squadre x partite: una sola chiamata per tutte le squadre di un campionato
+- NumPy si importa dentro le funzioni: storage usa questo modulo a ogni avvio dell'app
+"""
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS team_sequences (
+        season TEXT,
+        league TEXT,
+        team TEXT,
+        matches INTEGER,
+        dates BLOB,
+        home BLOB,
+        results BLOB,
+        gf BLOB,
+        ga BLOB,
+        shots BLOB,
+        shots_against BLOB,
+        UNIQUE (season, league, team)
+    )
+'''
+
+# Array salvati e tipo NumPy di ognuno
+# - dates: giorni dal 1970-01-01
+# - home: 1 casa, 0 trasferta
+# - results: 1 vittoria, 0 pareggio, -1 sconfitta
+# - tiri: -1 se non disponibili
+ARRAYS = {
+    'dates': 'int32',
+    'home': 'int8',
+    'results': 'int8',
+    'gf': 'int8',
+    'ga': 'int8',
+    'shots': 'int16',
+    'shots_against': 'int16',
+}
+
+# Partite giocate di una stagione (una sola partizione, vedi storage.sync_partition_view)
+# Le partite senza data (caricate prima che l'ingest le scartasse) non hanno un posto nella sequenza
+SEASON_SIDES = '''
+    SELECT l.code, h.name, a.name, m.date, m.fthg, m.ftag, m.hs, m.as_team
+    FROM match_data m
+    JOIN leagues l ON l.id = m.league_id
+    JOIN teams h ON h.id = m.home_id
+    JOIN teams a ON a.id = m.away_id
+    WHERE m.season_id IS ?
+      AND m.fthg IS NOT NULL AND m.ftag IS NOT NULL
+      AND m.date IS NOT NULL
+    ORDER BY m.date, m.time, m.id
+'''
+
+INSERT_SEQUENCE = (
+    f"INSERT INTO team_sequences (season, league, team, matches, {', '.join(ARRAYS)}) "
+    f"VALUES (?, ?, ?, ?, {', '.join('?' for _ in ARRAYS)})"
+)
+
+# Sequenze di una squadra dalla stagione più recente (si legge solo quanto serve)
+TEAM_SEQUENCES = f"""
+    SELECT season, league, {', '.join(ARRAYS)}
+    FROM team_sequences
+    WHERE team = ?
+    ORDER BY season DESC
+"""
+
+# Sequenze di tutte le squadre di un campionato in una stagione (league_form)
+LEAGUE_SEQUENCES = f"""
+    SELECT team, {', '.join(ARRAYS)}
+    FROM team_sequences
+    WHERE league = ? AND season = ?
+    ORDER BY team
+"""
+
+# Lettere della forma: sconfitta, pareggio, vittoria (indice = risultato + 1)
+FORM_LETTERS = 'PNV'
+
+# Casella vuota della matrice squadre x partite
+_PAD = -2
+
+FORM_COLUMNS = [
+    'team', 'form', 'points', 'gf', 'ga',
+    'win_streak', 'unbeaten_streak', 'longest_win_streak', 'longest_unbeaten_streak',
+]
+
+
+def _days(dates):
+    """Date ISO (YYYY-MM-DD) come giorni dal 1970-01-01"""
+    import numpy as np
+
+    return np.array([d[:10] for d in dates], dtype='datetime64[D]').astype(np.int32)
+
+
+def _stat(values):
+    """Colonna statistica con -1 al posto dei valori mancanti"""
+    import numpy as np
+
+    return np.array([-1 if v is None else v for v in values], dtype=np.int64)
+
+
+def refresh_season(conn, season, season_id):
+    """Inserisce le sequenze di una stagione già svuotata (vedi storage.refresh_materialized)"""
+    rows = conn.execute(SEASON_SIDES, (season_id,)).fetchall()
+    if rows:
+        conn.executemany(INSERT_SEQUENCE, _season_sequences(season, rows))
+
+
+def _season_sequences(season, rows):
+    """Righe di team_sequences da (campionato, casa, trasferta, data, gol, tiri) di una stagione"""
+    import numpy as np
+    import pandas as pd
+
+    league, home_team, away_team, dates, hg, ag, hs, as_ = zip(*rows)
+    hg, ag = np.array(hg, dtype=np.int64), np.array(ag, dtype=np.int64)
+    hs, as_ = _stat(hs), _stat(as_)
+    days = _days(dates)
+    n = len(rows)
+
+    # Due righe per partita (una per lato), raggruppate per (campionato, squadra) e ordinate per data
+    codes, keys = pd.factorize(pd.MultiIndex.from_arrays([league * 2, home_team + away_team]))
+    sides = {
+        'dates': np.concatenate((days, days)),
+        'home': np.concatenate((np.ones(n), np.zeros(n))),
+        'results': np.sign(np.concatenate((hg - ag, ag - hg))),
+        'gf': np.concatenate((hg, ag)),
+        'ga': np.concatenate((ag, hg)),
+        'shots': np.concatenate((hs, as_)),
+        'shots_against': np.concatenate((as_, hs)),
+    }
+    # La query è già in ordine di data, orario e id: basta la posizione della partita
+    order = np.lexsort((np.tile(np.arange(n), 2), codes))
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    arrays = {
+        name: np.split(values[order].astype(ARRAYS[name]), bounds)
+        for name, values in sides.items()
+    }
+
+    for i, group in enumerate(np.split(order, bounds)):
+        team_league, team = keys[codes[group[0]]]
+        yield (season, team_league, team, len(group),
+               *(arrays[name][i].tobytes() for name in ARRAYS))
+
+
+def _arrays(row):
+    """Array NumPy dai BLOB di una riga (nell'ordine di ARRAYS)"""
+    import numpy as np
+
+    return {
+        name: np.frombuffer(blob, dtype=dtype)
+        for (name, dtype), blob in zip(ARRAYS.items(), row)
+    }
+
+
+def team_sequence(conn, team, last=None):
+    """Partite della squadra in ordine di data (tutte o almeno le ultime last): {array: valori}
+
+    Comprende le colonne 'season' e 'league' di ogni partita.
+    """
+    import numpy as np
+
+    parts = []
+    count = 0
+    for season, league, *blobs in conn.execute(TEAM_SEQUENCES, (team,)):
+        arrays = _arrays(blobs)
+        size = len(arrays['dates'])
+        arrays['season'] = np.full(size, season, dtype=object)
+        arrays['league'] = np.full(size, league, dtype=object)
+        parts.append(arrays)
+        count += size
+        if last is not None and count >= last:
+            break
+
+    names = list(ARRAYS) + ['season', 'league']
+    if not parts:
+        return {name: np.array([], dtype=ARRAYS.get(name, object)) for name in names}
+    sequence = {name: np.concatenate([p[name] for p in parts]) for name in names}
+    # Stagioni lette dalla più recente (e più campionati nella stessa stagione): ordine di data
+    order = np.argsort(sequence['dates'], kind='stable')
+    sequence = {name: values[order] for name, values in sequence.items()}
+    if last is not None:
+        sequence = {name: values[-last:] for name, values in sequence.items()}
+    return sequence
+
+
+def _runs(mask):
+    """Lunghezza della serie in corso a ogni colonna di una matrice booleana (riga per riga)"""
+    import numpy as np
+
+    counts = np.cumsum(mask, axis=1)
+    # Ultimo conteggio prima di una interruzione: la serie riparte da lì
+    resets = np.maximum.accumulate(np.where(mask, 0, counts), axis=1)
+    return counts - resets
+
+
+def form_table(teams, results, gf, ga, n=5):
+    """Forma e serie di più squadre in una sola passata vettoriale
+
+    results, gf, ga: liste di array (uno per squadra) in ordine di data.
+    Restituisce un dizionario di colonne (vedi FORM_COLUMNS).
+    """
+    import numpy as np
+
+    lengths = np.array([len(r) for r in results], dtype=np.int64)
+    width = max(int(lengths.max(initial=0)), n, 1)
+
+    # Matrice squadre x partite allineata a destra: l'ultima colonna è la partita più recente
+    rows = np.repeat(np.arange(len(teams)), lengths)
+    offsets = np.cumsum(lengths) - lengths
+    cols = width - lengths[rows] + (np.arange(lengths.sum()) - offsets[rows])
+
+    def matrix(arrays, fill):
+        out = np.full((len(teams), width), fill, dtype=np.int64)
+        if len(rows):
+            out[rows, cols] = np.concatenate(arrays)
+        return out
+
+    res = matrix(results, _PAD)
+    goals_for = matrix(gf, 0)
+    goals_against = matrix(ga, 0)
+
+    played = res != _PAD
+    wins = res == 1
+    unbeaten = played & (res >= 0)
+    win_runs = _runs(wins)
+    unbeaten_runs = _runs(unbeaten)
+
+    last = res[:, -n:]
+    letters = np.where(last == _PAD, '', np.array(list(FORM_LETTERS))[np.clip(last + 1, 0, 2)])
+    points = np.where(last == 1, 3, np.where(last == 0, 1, 0))
+
+    return {
+        'team': list(teams),
+        'form': [''.join(row) for row in letters],
+        'points': points.sum(axis=1),
+        'gf': goals_for[:, -n:].sum(axis=1),
+        'ga': goals_against[:, -n:].sum(axis=1),
+        'win_streak': win_runs[:, -1],
+        'unbeaten_streak': unbeaten_runs[:, -1],
+        'longest_win_streak': win_runs.max(axis=1),
+        'longest_unbeaten_streak': unbeaten_runs.max(axis=1),
+    }
+
+
+def league_form(conn, league, season, n=5):
+    """Forma delle ultime n e serie di tutte le squadre di un campionato (DataFrame)"""
+    import pandas as pd
+
+    teams, sequences = [], []
+    for team, *blobs in conn.execute(LEAGUE_SEQUENCES, (league, season)):
+        teams.append(team)
+        sequences.append(_arrays(blobs))
+    table = form_table(
+        teams,
+        [s['results'] for s in sequences],
+        [s['gf'] for s in sequences],
+        [s['ga'] for s in sequences],
+        n,
+    )
+    return pd.DataFrame(table, columns=FORM_COLUMNS)
+
+
+def team_form(conn, team, n=5):
+    """Forma delle ultime n e serie (in corso e più lunghe) di una squadra su tutte le stagioni"""
+    sequence = team_sequence(conn, team)
+    table = form_table([team], [sequence['results']], [sequence['gf']], [sequence['ga']], n)
+    # Valori Python (non NumPy): pronti per st.metric e per il JSON
+    return {name: getattr(values[0], 'item', lambda: values[0])() for name, values in table.items()}
+
+
+def rolling_averages(sequence, window=5):
+    """Medie mobili su window partite (gol, tiri, punti) con le somme cumulate: DataFrame"""
+    import numpy as np
+    import pandas as pd
+
+    def rolling(values, valid=None):
+        values = values.astype(np.float64)
+        valid = np.ones(len(values), dtype=bool) if valid is None else valid
+        sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+        counts = np.concatenate(([0], np.cumsum(valid)))
+        start = np.maximum(np.arange(1, len(values) + 1) - window, 0)
+        end = np.arange(1, len(values) + 1)
+        count = counts[end] - counts[start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(count > 0, (sums[end] - sums[start]) / count, np.nan)
+
+    results = sequence['results']
+    return pd.DataFrame({
+        'date': sequence['dates'].astype('datetime64[D]'),
+        'gf': rolling(sequence['gf']),
+        'ga': rolling(sequence['ga']),
+        'shots': rolling(sequence['shots'], sequence['shots'] >= 0),
+        'shots_against': rolling(sequence['shots_against'], sequence['shots_against'] >= 0),
+        'points': rolling(np.where(results == 1, 3, np.where(results == 0, 1, 0))),
+    })
@@ -0,0 +1,103 @@
+"""
+Snapshot di sola lettura del database per i lettori
+- Dopo ogni scrittura confermata il database viene copiato con la backup API di SQLite
+- La copia viene compattata (auto_vacuum incrementale) e portata in journal_mode DELETE
+- Il file è scritto con un nome temporaneo e pubblicato con os.replace: un lettore vede
+  sempre uno snapshot completo, mai uno a metà
+- Un file per database e generazione dei dati (<db>_snapshot_<id database>_<generazione>.db),
+  mai modificato dopo la pubblicazione: i lettori lo aprono con immutable=1, senza lock né WAL
+- L'id del database distingue un file ricreato da zero: la sua generazione riparte da 0 e
+  non deve ritrovare gli snapshot del file precedente
+"""
+
+import glob
+import os
+import sqlite3
+import threading
+
+from fogna.storage import data_generation, database_id
+
+# Snapshot tenuti su disco: il corrente e il precedente (un lettore potrebbe stare aprendolo)
+KEEP = 2
+
+
+def snapshot_path(db_path, db_id, generation):
+    """Percorso dello snapshot di un database e di una generazione accanto al database"""
+    return f"{os.path.splitext(db_path)[0]}_snapshot_{db_id:x}_{generation}.db"
+
+
+def current_path(conn, db_path):
+    """Percorso dello snapshot che corrisponde allo stato attuale del database di conn"""
+    return snapshot_path(db_path, database_id(conn), data_generation(conn))
+
+
+def _snapshot_key(path):
+    """(id database, generazione) dal nome del file (None se non è uno snapshot di questo formato)"""
+    parts = os.path.splitext(path)[0].rsplit('_', 2)
+    if len(parts) != 3 or not parts[2].isdigit():
+        return None
+    try:
+        return int(parts[1], 16), int(parts[2])
+    except ValueError:
+        return None
+
+
+def snapshots(db_path):
+    """Snapshot su disco del database: [(id database, generazione, percorso)], dal più recente"""
+    found = []
+    for path in glob.glob(glob.escape(os.path.splitext(db_path)[0]) + '_snapshot_*.db'):
+        key = _snapshot_key(path)
+        found.append((*(key or (None, -1)), path))
+    return sorted(found, key=lambda s: s[1], reverse=True)
+
+
+def publish(conn, db_path):
+    """Pubblica lo snapshot della generazione corrente (se manca) e restituisce il percorso
+
+    conn è una connessione al database, fuori da una transazione.
+    """
+    path = current_path(conn, db_path)
+    if not os.path.exists(path):
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        target = sqlite3.connect(tmp)
+        try:
+            conn.backup(target)
+            target.execute("PRAGMA journal_mode = DELETE")
+            # Le pagine libere (stagioni eliminate o sovrascritte) non finiscono nello snapshot
+            target.executescript("PRAGMA incremental_vacuum")
+            # Nome dal contenuto copiato: un altro processo può aver scritto nel frattempo
+            path = current_path(target, db_path)
+            target.close()
+        except BaseException:
+            target.close()
+            os.remove(tmp)
+            raise
+        os.replace(tmp, path)
+
+    cleanup(db_path, keep=path)
+    return path
+
+
+def cleanup(db_path, keep):
+    """Elimina gli snapshot vecchi: tiene keep e i KEEP più recenti dello stesso database
+
+    Gli snapshot di un altro id (database ricreato) o di un formato precedente vengono eliminati.
+    """
+    db_id = _snapshot_key(keep)[0]
+    found = snapshots(db_path)
+    own = [path for i, _, path in found if i == db_id]
+    stale = [path for i, _, path in found if i != db_id] + own[KEEP:]
+    for path in stale:
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            # Su Windows un file aperto da un lettore non si può eliminare: sarà per la prossima volta
+            pass
+
+
+def open_snapshot(path, factory=sqlite3.Connection):
+    """Connessione di sola lettura a uno snapshot (immutable: nessun lock, nessun WAL)"""
+    uri = f"file:{os.path.abspath(path)}?mode=ro&immutable=1"
+    return sqlite3.connect(uri, uri=True, check_same_thread=False, factory=factory)
@@ -0,0 +1,128 @@
+"""
+Classifiche complete (casa + trasferta) calcolate con NumPy
+- Squadre codificate come interi, statistiche con np.bincount in un solo passaggio
+- Criteri: punti, differenza reti, gol fatti, classifica avulsa (scontri diretti), nome
+- Più campionati di una stagione calcolati insieme in una sola chiamata
+"""
+
+import numpy as np
+import pandas as pd
+
+from fogna import queries
+
+STANDINGS_COLUMNS = ['team', 'played', 'wins', 'draws', 'losses', 'gf', 'ga', 'gd', 'points']
+
+
+def _table(home, away, hg, ag, n):
+    """Statistiche per squadra (codici 0..n-1) dalle partite indicate"""
+    home_win = hg > ag
+    away_win = ag > hg
+    draw = hg == ag
+
+    def count(mask):
+        return np.bincount(home[mask], minlength=n), np.bincount(away[mask], minlength=n)
+
+    hw, aw = count(home_win)
+    hl, al = count(away_win)
+    hd, ad = count(draw)
+    wins = hw + al
+    draws = hd + ad
+    losses = hl + aw
+
+    gf = np.bincount(home, weights=hg, minlength=n) + np.bincount(away, weights=ag, minlength=n)
+    ga = np.bincount(home, weights=ag, minlength=n) + np.bincount(away, weights=hg, minlength=n)
+
+    return {
+        'played': wins + draws + losses,
+        'wins': wins,
+        'draws': draws,
+        'losses': losses,
+        'gf': gf.astype(np.int64),
+        'ga': ga.astype(np.int64),
+        'gd': (gf - ga).astype(np.int64),
+        'points': wins * 3 + draws,
+    }
+
+
+def _head_to_head(group, home, away, hg, ag, name_rank):
+    """Riordina un gruppo di squadre a pari merito con la classifica avulsa"""
+    members = np.zeros(len(name_rank), dtype=bool)
+    members[group] = True
+    mask = members[home] & members[away]
+
+    mini = _table(home[mask], away[mask], hg[mask], ag[mask], len(name_rank))
+    order = np.lexsort((
+        name_rank[group],
+        -mini['gf'][group],
+        -mini['gd'][group],
+        -mini['points'][group],
+    ))
+    return group[order]
+
+
+def compute_standings(matches):
+    """Classifica di uno o più campionati da un DataFrame di partite
+
+    Colonne richieste: home_team, away_team, fthg, ftag (e div per più campionati).
+    Restituisce un DataFrame ordinato con la colonna 'league' se presente 'div'.
+    """
+    matches = matches.dropna(subset=['fthg', 'ftag'])
+    leagues = matches['div'] if 'div' in matches.columns else pd.Series('', index=matches.index)
+
+    # Chiave squadra = (campionato, squadra): una stessa squadra in due campionati resta separata
+    keys = pd.MultiIndex.from_arrays([
+        pd.concat([leagues, leagues], ignore_index=True),
+        pd.concat([matches['home_team'], matches['away_team']], ignore_index=True),
+    ])
+    codes, uniques = pd.factorize(keys)
+    n_matches = len(matches)
+    home = codes[:n_matches]
+    away = codes[n_matches:]
+    hg = matches['fthg'].to_numpy(dtype=np.int64)
+    ag = matches['ftag'].to_numpy(dtype=np.int64)
+
+    n = len(uniques)
+    team_leagues = np.asarray(uniques.get_level_values(0), dtype=object)
+    names = np.asarray(uniques.get_level_values(1), dtype=object)
+    stats = _table(home, away, hg, ag, n)
+
+    # Ranghi interi per ordinare nomi e campionati (lexsort non accetta oggetti)
+    name_rank = pd.factorize(names, sort=True)[0]
+    league_rank = pd.factorize(team_leagues, sort=True)[0]
+
+    # Ordinamento principale: campionato, punti, differenza reti, gol fatti
+    order = np.lexsort((name_rank, -stats['gf'], -stats['gd'], -stats['points'], league_rank))
+
+    # Gruppi a pari merito sugli stessi criteri -> scontri diretti
+    sort_keys = np.stack([league_rank, stats['points'], stats['gd'], stats['gf']])[:, order]
+    boundaries = np.flatnonzero(np.any(sort_keys[:, 1:] != sort_keys[:, :-1], axis=0)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [n]))
+    for start, end in zip(starts, ends):
+        if end - start > 1:
+            order[start:end] = _head_to_head(order[start:end], home, away, hg, ag, name_rank)
+
+    df = pd.DataFrame({'team': names[order]})
+    for col in STANDINGS_COLUMNS[1:]:
+        df[col] = stats[col][order]
+    if 'div' in matches.columns:
+        df.insert(0, 'league', team_leagues[order])
+    return df
+
+
+def league_standings(conn, league, season):
+    """Classifica completa di un campionato in una stagione"""
+    season_id = queries.season_id(conn, season)
+    matches = pd.read_sql_query(queries.LEAGUE_MATCHES, conn, params=(league, season_id))
+    return compute_standings(matches)
+
+
+def season_standings(conn, season):
+    """Classifiche di tutti i campionati di una stagione: {campionato: DataFrame}"""
+    season_id = queries.season_id(conn, season)
+    matches = pd.read_sql_query(queries.SEASON_MATCHES, conn, params=(season_id,))
+    df = compute_standings(matches)
+    return {
+        league: table.drop(columns='league').reset_index(drop=True)
+        for league, table in df.groupby('league', sort=True)
+    }
@@ -0,0 +1,733 @@
+"""
+Database SQLite: schema, PRAGMA e scrittura massiva delle partite
+- Schema normalizzato: leagues / seasons / teams + partite con chiavi intere
+- Partite partizionate per stagione: una tabella match_data_<id stagione> per stagione,
+  unite dalla vista match_data (sovrascrivere o eliminare una stagione = DROP TABLE)
+- La vista "matches" mantiene le colonne originali per le query di lettura
+- Nomi delle squadre normalizzati durante il caricamento (vedi fogna.teams)
+"""
+
+import io
+import secrets
+import sqlite3
+from collections import Counter
+
+from fogna import aggregates, head_to_head, queries, sequences, teams
+from fogna.ingest import file_fingerprint, iter_workbook, read_source, sheet_fingerprints
+
+DB_PATH = 'football_stats.db'
+
+# PRAGMA applicati a ogni connessione
+# - auto_vacuum prima di WAL: su un file nuovo vale solo se impostato prima della prima scrittura
+# - WAL: i lettori non si bloccano durante una scrittura
+# - cache di 64 MB (valore negativo = KiB)
+PRAGMAS = [
+    "PRAGMA auto_vacuum = INCREMENTAL",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA temp_store = MEMORY",
+]
+
+# Tabelle di lookup: ogni nome è salvato una sola volta e referenziato per id
+LOOKUP_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS leagues (id INTEGER PRIMARY KEY, code TEXT UNIQUE NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS seasons (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS teams (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL)",
+]
+
+# Tabella unica delle versioni precedenti (solo per le migrazioni, vedi partition_match_data)
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS match_data (
+        id INTEGER PRIMARY KEY,
+        league_id INTEGER NOT NULL REFERENCES leagues (id),
+        season_id INTEGER REFERENCES seasons (id),
+        date TEXT,
+        time TEXT,
+        home_id INTEGER NOT NULL REFERENCES teams (id),
+        away_id INTEGER NOT NULL REFERENCES teams (id),
+        fthg INTEGER,
+        ftag INTEGER,
+        ftr TEXT,
+        hthg INTEGER,
+        htag INTEGER,
+        htr TEXT,
+        hs INTEGER,
+        as_team INTEGER,
+        hst INTEGER,
+        ast INTEGER,
+        hf INTEGER,
+        af INTEGER,
+        hc INTEGER,
+        ac INTEGER,
+        hy INTEGER,
+        ay INTEGER,
+        hr INTEGER,
+        ar INTEGER,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+# Partizione di una stagione: stesse colonne senza season_id (è il nome della tabella)
+PARTITION_SCHEMA = '''
+    CREATE TABLE {table} (
+        id INTEGER PRIMARY KEY,
+        league_id INTEGER NOT NULL REFERENCES leagues (id),
+        date TEXT,
+        time TEXT,
+        home_id INTEGER NOT NULL REFERENCES teams (id),
+        away_id INTEGER NOT NULL REFERENCES teams (id),
+        fthg INTEGER,
+        ftag INTEGER,
+        ftr TEXT,
+        hthg INTEGER,
+        htag INTEGER,
+        htr TEXT,
+        hs INTEGER,
+        as_team INTEGER,
+        hst INTEGER,
+        ast INTEGER,
+        hf INTEGER,
+        af INTEGER,
+        hc INTEGER,
+        ac INTEGER,
+        hy INTEGER,
+        ay INTEGER,
+        hr INTEGER,
+        ar INTEGER,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+# Prefisso delle partizioni: match_data_<id stagione>, match_data_0 per le partite senza stagione
+PARTITION_PREFIX = 'match_data_'
+
+# Vista di compatibilità: stesse colonne della vecchia tabella matches
+VIEW = '''
+    CREATE VIEW IF NOT EXISTS matches AS
+    SELECT m.id, l.code AS div, m.date, m.time,
+           h.name AS home_team, a.name AS away_team,
+           m.fthg, m.ftag, m.ftr, m.hthg, m.htag, m.htr,
+           m.hs, m.as_team, m.hst, m.ast, m.hf, m.af, m.hc, m.ac,
+           m.hy, m.ay, m.hr, m.ar,
+           s.name AS season, m.created_at
+    FROM match_data m
+    JOIN leagues l ON l.id = m.league_id
+    JOIN teams h ON h.id = m.home_id
+    JOIN teams a ON a.id = m.away_id
+    LEFT JOIN seasons s ON s.id = m.season_id
+'''
+
+# Colonne statistiche copiate così come sono (stesso nome in ingest.COLUMNS e match_data)
+STAT_COLUMNS = [
+    'fthg', 'ftag', 'ftr', 'hthg', 'htag', 'htr',
+    'hs', 'as_team', 'hst', 'ast', 'hf', 'af', 'hc', 'ac',
+    'hy', 'ay', 'hr', 'ar'
+]
+MATCH_COLUMNS = ['league_id', 'season_id', 'date', 'time', 'home_id', 'away_id'] + STAT_COLUMNS
+PARTITION_COLUMNS = ['league_id', 'date', 'time', 'home_id', 'away_id'] + STAT_COLUMNS
+
+# Colonne della vista match_data (season_id è una costante in ogni ramo della UNION ALL)
+VIEW_COLUMNS = ['id'] + MATCH_COLUMNS + ['created_at']
+
+# Contatore "generazione dati": incrementato da ogni scrittura, usato dalla cache
+META_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value INTEGER
+    )
+'''
+
+GENERATION_KEY = 'data_generation'
+
+# Ultimo id di partita assegnato: gli id restano unici tra le partizioni
+MATCH_ID_KEY = 'match_id'
+
+# Identificativo casuale del file di database, scritto alla creazione dello schema:
+# la generazione riparte da 0 su un database nuovo, l'identificativo no (vedi fogna.snapshot)
+DATABASE_ID_KEY = 'database_id'
+
+# Impronte dei file caricati: sheet = '' per l'intero workbook
+FINGERPRINT_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS file_fingerprints (
+        season TEXT,
+        sheet TEXT,
+        sha256 TEXT,
+        loaded_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (season, sheet)
+    )
+'''
+
+# Chiave naturale di una partita: caricare due volte lo stesso file non crea doppioni
+NATURAL_KEY = ['league_id', 'date', 'home_id', 'away_id']
+
+# Indici gestiti: creati/aggiornati all'avvio da ensure_indexes()
+# Le colonne finali rendono gli indici "coprenti" per le query delle pagine
+INDEXES = {
+    'idx_tss_league_season':
+        "CREATE INDEX idx_tss_league_season ON team_season_stats (league, season)",
+    'idx_tss_team_season':
+        "CREATE INDEX idx_tss_team_season ON team_season_stats (team, season)",
+    'idx_team_sequences_league_season':
+        "CREATE INDEX idx_team_sequences_league_season ON team_sequences (league, season)",
+    'idx_team_sequences_team_season':
+        "CREATE INDEX idx_team_sequences_team_season ON team_sequences (team, season)",
+    'idx_pair_stats_pair':
+        "CREATE INDEX idx_pair_stats_pair ON pair_stats (team_a, team_b, season)",
+    'idx_pair_stats_league_season':
+        "CREATE INDEX idx_pair_stats_league_season ON pair_stats (league, season)",
+    'idx_team_aliases_team':
+        "CREATE INDEX idx_team_aliases_team ON team_aliases (team_id)",
+}
+
+# Indici di ogni partizione ({index} = idx_<partizione>_<suffisso>)
+# La stagione non serve: ogni partizione contiene una sola stagione
+PARTITION_INDEXES = {
+    'natural': f"CREATE UNIQUE INDEX {{index}} ON {{table}} ({', '.join(NATURAL_KEY)})",
+    'league_home': "CREATE INDEX {index} ON {table} (league_id, home_id, away_id, fthg, ftag)",
+    'league_away': "CREATE INDEX {index} ON {table} (league_id, away_id, fthg, ftag)",
+    'date': "CREATE INDEX {index} ON {table} (date)",
+    # Coppia non ordinata: trova le partite tra due squadre in entrambi i campi
+    'pair': "CREATE INDEX {index} ON {table} (min(home_id, away_id), max(home_id, away_id), date)",
+}
+
+# Upsert: una partita già presente viene aggiornata con i nuovi valori (l'id resta quello vecchio)
+INSERT_MATCH = (
+    f"INSERT INTO {{table}} (id, {', '.join(PARTITION_COLUMNS)}) "
+    f"VALUES (?, {', '.join('?' for _ in PARTITION_COLUMNS)}) "
+    f"ON CONFLICT ({', '.join(NATURAL_KEY)}) DO UPDATE SET "
+    + ', '.join(f"{c} = excluded.{c}" for c in PARTITION_COLUMNS if c not in NATURAL_KEY)
+)
+
+# Tabelle materializzate per stagione: (tabella, DDL, ricalcolo di una stagione già svuotata)
+# Ricalcolate insieme da refresh_materialized dopo ogni scrittura delle partite
+MATERIALIZED = [
+    ('team_season_stats', aggregates.SCHEMA, aggregates.refresh_season),
+    ('team_sequences', sequences.SCHEMA, sequences.refresh_season),
+    ('pair_stats', head_to_head.SCHEMA, head_to_head.refresh_season),
+]
+
+
+def connect(path=DB_PATH, factory=sqlite3.Connection):
+    """Apre una connessione con i PRAGMA di prestazione"""
+    conn = sqlite3.connect(path, check_same_thread=False, factory=factory)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def create_schema(conn):
+    """Crea tabelle, viste e indici se non esistono (migra i vecchi schemi)"""
+    schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+    conn.execute(META_SCHEMA)
+    conn.execute(
+        "INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)", (DATABASE_ID_KEY, secrets.randbits(62))
+    )
+    conn.execute(FINGERPRINT_SCHEMA)
+    for ddl in LOOKUP_SCHEMA:
+        conn.execute(ddl)
+
+    legacy = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'matches'"
+    ).fetchone()
+    if legacy:
+        conn.execute(SCHEMA)
+        migrate_legacy_matches(conn)
+
+    unpartitioned = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'match_data'"
+    ).fetchone()
+    if unpartitioned:
+        partition_match_data(conn)
+    sync_partition_view(conn)
+    conn.execute(VIEW)
+
+    has_aliases = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'team_aliases'"
+    ).fetchone()
+    conn.execute(teams.ALIAS_SCHEMA)
+    conn.execute(teams.SEARCH_SCHEMA)
+    # Primo avvio con gli alias: le grafie già caricate con la stessa chiave diventano una squadra
+    merged = not has_aliases and normalize_team_names(conn)
+
+    # Prima creazione di una tabella materializzata: la popola dalle partite esistenti
+    missing = []
+    for table, schema, _ in MATERIALIZED:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        conn.execute(schema)
+        if not exists or merged:
+            missing.append(table)
+    if missing:
+        rebuild_materialized(conn, missing)
+
+    ensure_indexes(conn)
+    if conn.execute("PRAGMA schema_version").fetchone()[0] != schema_version:
+        # Schema cambiato (tabelle nuove o ricostruite): cache e snapshot vanno rinnovati
+        bump_generation(conn)
+    conn.commit()
+
+    if legacy or unpartitioned:
+        # Recupera lo spazio della vecchia tabella e attiva auto_vacuum incrementale
+        conn.execute("VACUUM")
+
+
+def migrate_legacy_matches(conn):
+    """Copia la vecchia tabella matches (testo ripetuto) nello schema normalizzato"""
+    conn.execute("INSERT OR IGNORE INTO leagues (code) SELECT DISTINCT div FROM matches WHERE div IS NOT NULL")
+    conn.execute("INSERT OR IGNORE INTO seasons (name) SELECT DISTINCT season FROM matches WHERE season IS NOT NULL")
+    conn.execute(
+        "INSERT OR IGNORE INTO teams (name) "
+        "SELECT home_team FROM matches WHERE home_team IS NOT NULL "
+        "UNION SELECT away_team FROM matches WHERE away_team IS NOT NULL"
+    )
+
+    # Partite più recenti per prime, così ricevono gli id più bassi: match_data non ha ancora
+    # una chiave naturale e i doppioni restano; partition_match_data tiene l'id più basso,
+    # cioè la copia caricata per ultima
+    stats = ', '.join(f"m.{c}" for c in STAT_COLUMNS)
+    conn.execute(f"""
+        INSERT INTO match_data ({', '.join(MATCH_COLUMNS)}, created_at)
+        SELECT l.id, s.id, substr(m.date, 1, 10), m.time, h.id, a.id, {stats}, m.created_at
+        FROM matches m
+        JOIN leagues l ON l.code = m.div
+        JOIN teams h ON h.name = m.home_team
+        JOIN teams a ON a.name = m.away_team
+        LEFT JOIN seasons s ON s.name = m.season
+        ORDER BY m.id DESC
+    """)
+    conn.execute("DROP TABLE matches")
+    conn.execute("DROP TABLE IF EXISTS team_season_stats")
+    bump_generation(conn)
+
+
+def partition_match_data(conn):
+    """Divide la vecchia tabella unica match_data in una partizione per stagione"""
+    season_ids = [row[0] for row in conn.execute("SELECT DISTINCT season_id FROM match_data")]
+    columns = ', '.join(PARTITION_COLUMNS)
+    for season_id in season_ids:
+        table = create_partition(conn, season_id)
+        # Stessi id: in caso di doppioni resta la riga con l'id più basso
+        conn.execute(
+            f"INSERT OR IGNORE INTO {table} (id, {columns}, created_at) "
+            f"SELECT id, {columns}, created_at FROM match_data WHERE season_id IS ? ORDER BY id",
+            (season_id,),
+        )
+    last_id = conn.execute("SELECT MAX(id) FROM match_data").fetchone()[0] or 0
+    conn.execute(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (MATCH_ID_KEY, last_id)
+    )
+    conn.execute("DROP TABLE match_data")
+    bump_generation(conn)
+
+
+def partition_name(season_id):
+    """Nome della partizione di una stagione (0 = partite senza stagione)"""
+    return f"{PARTITION_PREFIX}{season_id or 0}"
+
+
+def partitions(conn):
+    """Partizioni esistenti: {id stagione (None = senza stagione): tabella}"""
+    rows = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ? ORDER BY name",
+        (f"{PARTITION_PREFIX}[0-9]*",),
+    ).fetchall()
+    found = {}
+    for (name,) in rows:
+        season_id = int(name[len(PARTITION_PREFIX):])
+        found[season_id or None] = name
+    return found
+
+
+def _partition_indexes(table):
+    """Indici di una partizione: {nome: DDL}"""
+    indexes = {}
+    for suffix, template in PARTITION_INDEXES.items():
+        name = f"idx_{table}_{suffix}"
+        indexes[name] = template.format(index=name, table=table)
+    return indexes
+
+
+def create_partition(conn, season_id):
+    """Crea (se manca) la partizione di una stagione con i suoi indici; restituisce il nome"""
+    table = partition_name(season_id)
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    if not exists:
+        conn.execute(PARTITION_SCHEMA.format(table=table))
+        for sql in _partition_indexes(table).values():
+            conn.execute(sql)
+    return table
+
+
+def drop_partition(conn, season_id):
+    """Elimina la partizione di una stagione (indici compresi)"""
+    conn.execute(f"DROP TABLE IF EXISTS {partition_name(season_id)}")
+
+
+def sync_partition_view(conn):
+    """Ricrea la vista match_data se le partizioni sono cambiate
+
+    Ogni ramo della UNION ALL espone season_id come costante: con un id di stagione
+    passato come parametro (season_id = ?) SQLite salta i rami delle altre stagioni.
+    """
+    arms = []
+    for season_id, table in partitions(conn).items():
+        columns = ['id', 'league_id', f"{season_id or 'NULL'} AS season_id"]
+        columns += PARTITION_COLUMNS[1:] + ['created_at']
+        arms.append(f"SELECT {', '.join(columns)} FROM {table}")
+    if not arms:
+        # Nessuna partita: vista vuota con le stesse colonne
+        arms.append(f"SELECT {', '.join('NULL' for _ in VIEW_COLUMNS)} WHERE 0")
+    sql = (
+        f"CREATE VIEW match_data ({', '.join(VIEW_COLUMNS)}) AS\n"
+        + "\nUNION ALL\n".join(arms)
+    )
+
+    existing = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'view' AND name = 'match_data'"
+    ).fetchone()
+    if existing and existing[0] == sql:
+        return
+    conn.execute("DROP VIEW IF EXISTS match_data")
+    conn.execute(sql)
+
+
+def ensure_indexes(conn):
+    """Allinea gli indici gestiti a INDEXES e PARTITION_INDEXES (crea, ricrea o elimina)"""
+    expected = dict(INDEXES)
+    for table in partitions(conn).values():
+        expected.update(_partition_indexes(table))
+    existing = dict(conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"
+    ).fetchall())
+
+    changed = False
+    for name, sql in existing.items():
+        if expected.get(name) != sql:
+            conn.execute(f"DROP INDEX {name}")
+            changed = True
+    for name, sql in expected.items():
+        if existing.get(name) != sql:
+            conn.execute(sql)
+            changed = True
+
+    if changed:
+        # Statistiche aggiornate per il query planner
+        conn.execute("ANALYZE")
+
+
+def _format_time(value):
+    """Orario come testo HH:MM"""
+    if hasattr(value, 'strftime'):
+        return value.strftime('%H:%M')
+    return value
+
+
+def _lookup_ids(conn, table, column, names):
+    """Id dei nomi nella tabella di lookup (i nomi nuovi vengono inseriti)"""
+    conn.executemany(
+        f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)",
+        [(name,) for name in names if name is not None],
+    )
+    return dict(conn.execute(f"SELECT {column}, id FROM {table}").fetchall())
+
+
+def _next_ids(conn, count):
+    """Riserva count id di partita consecutivi (unici tra tutte le partizioni)"""
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+        (MATCH_ID_KEY, count),
+    )
+    last = conn.execute("SELECT value FROM meta WHERE key = ?", (MATCH_ID_KEY,)).fetchone()[0]
+    return range(last - count + 1, last + 1)
+
+
+def _chunk_rows(conn, chunk):
+    """Converte un blocco DataFrame in tuple per le partizioni: {id stagione: righe} (nomi -> id interi)"""
+    names = set(chunk['home_team'].dropna()) | set(chunk['away_team'].dropna())
+    team_ids = teams.team_ids(conn, names)
+    league_ids = _lookup_ids(conn, 'leagues', 'code', set(chunk['div'].dropna()))
+    season_ids = _lookup_ids(conn, 'seasons', 'name', set(chunk['season'].dropna()))
+
+    import pandas as pd
+
+    df = pd.DataFrame({
+        'league_id': chunk['div'].map(league_ids),
+        'season_id': chunk['season'].map(season_ids),
+        'date': chunk['date'].dt.strftime('%Y-%m-%d'),
+        'time': chunk['time'].map(_format_time),
+        'home_id': chunk['home_team'].map(team_ids),
+        'away_id': chunk['away_team'].map(team_ids),
+    })
+    for col in STAT_COLUMNS:
+        df[col] = chunk[col]
+    df = df.astype(object)
+    df = df.where(df.notna(), None)
+
+    seasons = df.pop('season_id')
+    parts = {}
+    for value in seasons.drop_duplicates():
+        # Con stagioni mancanti nel blocco gli id arrivano come float
+        season_id = None if value is None else int(value)
+        mask = seasons.isna() if value is None else seasons == value
+        part = df[mask.to_numpy()]
+        ids = _next_ids(conn, len(part))
+        parts[season_id] = [(i, *row) for i, row in zip(ids, part.itertuples(index=False, name=None))]
+    return parts
+
+
+def bulk_load(conn, chunks, season=None, overwrite=False, fingerprints=None):
+    """Scrive tutti i blocchi in UNA transazione (eventuale sovrascrittura compresa)
+
+    In modalità "overwrite" la partizione della stagione viene eliminata e ricreata al primo
+    blocco con righe: un file senza partite valide lascia la stagione com'è.
+    fingerprints ({foglio: sha256}) viene salvato nella stessa transazione.
+    """
+    total = 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for chunk in chunks:
+            if not len(chunk):
+                continue
+            if overwrite and season and total == 0:
+                season_id = queries.season_id(conn, season)
+                if season_id is not None:
+                    drop_partition(conn, season_id)
+                conn.execute(queries.DELETE_FINGERPRINTS, (season,))
+            for season_id, rows in _chunk_rows(conn, chunk).items():
+                table = create_partition(conn, season_id)
+                conn.executemany(INSERT_MATCH.format(table=table), rows)
+            total += len(chunk)
+        sync_partition_view(conn)
+        if total:
+            refresh_materialized(conn, [season])
+            bump_generation(conn)
+        if fingerprints and season and (total or not overwrite):
+            conn.executemany(
+                "INSERT OR REPLACE INTO file_fingerprints (season, sheet, sha256) VALUES (?, ?, ?)",
+                [(season, sheet, digest) for sheet, digest in fingerprints.items()],
+            )
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    if overwrite:
+        release_space(conn)
+    return total
+
+
+def ingest_workbook(conn, source, season, overwrite=False, progress=None):
+    """Carica un workbook saltando i fogli già caricati e non modificati
+
+    Restituisce {'rows': righe scritte, 'loaded': fogli letti, 'skipped': fogli invariati,
+    'undated': righe senza data scartate}.
+    In modalità "overwrite" la stagione viene ricaricata per intero.
+    progress(foglio, righe, finito) riceve l'avanzamento (vedi iter_workbook).
+    """
+    data = read_source(source)
+    plan = plan_ingest(conn, data, season, overwrite)
+    if not plan['fingerprints']:
+        # File identico a quello già caricato
+        return {'rows': 0, 'loaded': [], 'skipped': plan['skipped'], 'undated': 0}
+
+    workbook = io.BytesIO(data)
+    workbook.name = getattr(source, 'name', str(source))
+    undated = Counter()
+
+    rows = bulk_load(
+        conn,
+        iter_workbook(workbook, season, sheets=plan['sheets'], progress=progress, undated=undated),
+        season=season,
+        overwrite=overwrite,
+        fingerprints=plan['fingerprints'],
+    )
+    return {
+        'rows': rows, 'loaded': plan['loaded'], 'skipped': plan['skipped'], 'undated': sum(undated.values()),
+    }
+
+
+def plan_ingest(conn, data, season, overwrite=False):
+    """Confronta le impronte del file con quelle salvate e decide quali fogli leggere
+
+    Restituisce {'sheets': fogli da leggere (None = tutti), 'fingerprints': impronte da salvare
+    (vuoto se il file è già caricato), 'loaded': fogli letti, 'skipped': fogli invariati}.
+    """
+    workbook_hash = file_fingerprint(data)
+    sheet_hashes = sheet_fingerprints(data)
+
+    stored = {}
+    # Database senza la tabella delle impronte (prova in sola lettura su uno schema vecchio):
+    # nessun file risulta ancora caricato
+    has_fingerprints = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'file_fingerprints'"
+    ).fetchone()
+    if season and not overwrite and has_fingerprints:
+        stored = dict(conn.execute(queries.FINGERPRINTS, (season,)).fetchall())
+
+    if stored.get('') == workbook_hash:
+        return {'sheets': [], 'fingerprints': {}, 'loaded': [], 'skipped': list(sheet_hashes)}
+
+    if sheet_hashes:
+        changed = [sheet for sheet, digest in sheet_hashes.items() if stored.get(sheet) != digest]
+    else:
+        # .xls: nessuna impronta per foglio, si rilegge tutto
+        changed = None
+
+    fingerprints = {'': workbook_hash}
+    fingerprints.update({sheet: sheet_hashes[sheet] for sheet in changed or []})
+
+    loaded = list(sheet_hashes) if changed is None else changed
+    return {
+        'sheets': changed,
+        'fingerprints': fingerprints,
+        'loaded': loaded,
+        'skipped': [sheet for sheet in sheet_hashes if sheet not in loaded],
+    }
+
+
+def delete_season(conn, season):
+    """Elimina una stagione (DROP della partizione) e le sue statistiche aggregate in una transazione"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        season_id = queries.season_id(conn, season)
+        if season_id is not None:
+            drop_partition(conn, season_id)
+            sync_partition_view(conn)
+        conn.execute(queries.DELETE_FINGERPRINTS, (season,))
+        refresh_materialized(conn, [season])
+        bump_generation(conn)
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    release_space(conn)
+
+
+def normalize_team_names(conn):
+    """Crea gli alias delle squadre esistenti e unisce quelle con la stessa chiave (senza commit)
+
+    Resta la squadra caricata per prima. Restituisce True se qualche squadra è stata unita.
+    """
+    canonical = {}
+    merged = False
+    for team_id, name in conn.execute("SELECT id, name FROM teams ORDER BY id").fetchall():
+        key = teams.normalize(name)
+        if key in canonical:
+            _merge_team(conn, team_id, canonical[key])
+            merged = True
+        else:
+            teams.add_alias(conn, key, team_id, name)
+            canonical[key] = team_id
+    return merged
+
+
+def _merge_team(conn, source_id, target_id):
+    """Sposta partite e alias di una squadra su un'altra ed elimina la prima (senza commit)
+
+    Restituisce le stagioni con partite spostate (da ricalcolare).
+    Una partita presente con entrambe le grafie resta una sola (vince quella spostata).
+    """
+    touched = set()
+    for season_id, table in partitions(conn).items():
+        changed = 0
+        for column in ('home_id', 'away_id'):
+            changed += conn.execute(
+                f"UPDATE OR REPLACE {table} SET {column} = ? WHERE {column} = ?", (target_id, source_id)
+            ).rowcount
+        if changed:
+            touched.add(season_id)
+    conn.execute("UPDATE team_aliases SET team_id = ? WHERE team_id = ?", (target_id, source_id))
+    conn.execute("DELETE FROM teams WHERE id = ?", (source_id,))
+    names = dict(conn.execute("SELECT id, name FROM seasons").fetchall())
+    return [names.get(season_id) for season_id in touched]
+
+
+def add_team_alias(conn, alias, team):
+    """Collega una grafia alla squadra team in una transazione
+
+    Se la grafia è già una squadra le sue partite passano a team e le stagioni toccate
+    vengono ricalcolate. Restituisce le stagioni ricalcolate.
+    """
+    key = teams.normalize(alias)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            "SELECT team_id FROM team_aliases WHERE key = ?", (teams.normalize(team),)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Squadra sconosciuta: {team}")
+        target_id = row[0]
+
+        seasons = []
+        current = conn.execute("SELECT team_id FROM team_aliases WHERE key = ?", (key,)).fetchone()
+        if current is None:
+            teams.add_alias(conn, key, target_id, alias, manual=True)
+        elif current[0] != target_id:
+            seasons = _merge_team(conn, current[0], target_id)
+            conn.execute("UPDATE team_aliases SET manual = 1 WHERE key = ?", (key,))
+
+        if seasons:
+            refresh_materialized(conn, seasons)
+        bump_generation(conn)
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return seasons
+
+
+def refresh_materialized(conn, seasons, tables=None):
+    """Ricalcola le tabelle materializzate (tutte o quelle indicate) per le stagioni indicate (senza commit)
+
+    None = partite senza stagione; una stagione sconosciuta viene solo svuotata.
+    """
+    registered = [entry for entry in MATERIALIZED if tables is None or entry[0] in tables]
+    for season in seasons:
+        season_id = None if season is None else queries.season_id(conn, season)
+        for table, _, refresh in registered:
+            conn.execute(f"DELETE FROM {table} WHERE season IS ?", (season,))
+            if season is None or season_id is not None:
+                refresh(conn, season, season_id)
+
+
+def rebuild_materialized(conn, tables=None):
+    """Ricostruisce per intero le tabelle materializzate (tutte o quelle indicate) (senza commit)"""
+    names = dict(conn.execute("SELECT id, name FROM seasons").fetchall())
+    seasons = [names.get(season_id) for season_id in partitions(conn)]
+    for table, _, _ in MATERIALIZED:
+        if tables is None or table in tables:
+            conn.execute(f"DELETE FROM {table}")
+    refresh_materialized(conn, seasons, tables)
+
+
+def release_space(conn):
+    """Restituisce al filesystem le pagine liberate (auto_vacuum incrementale)
+
+    executescript esegue il PRAGMA fino in fondo: execute libererebbe una sola pagina.
+    """
+    conn.executescript("PRAGMA incremental_vacuum")
+
+
+def data_generation(conn):
+    """Generazione corrente dei dati (0 se mai scritti)"""
+    row = conn.execute(queries.GENERATION, (GENERATION_KEY,)).fetchone()
+    return row[0] if row else 0
+
+
+def database_id(conn):
+    """Identificativo del file di database (0 se lo schema non è mai stato creato)"""
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (DATABASE_ID_KEY,)).fetchone()
+    return row[0] if row else 0
+
+
+def bump_generation(conn):
+    """Incrementa la generazione dei dati (da chiamare dentro la transazione di scrittura)"""
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, 1) "
+        "ON CONFLICT(key) DO UPDATE SET value = value + 1",
+        (GENERATION_KEY,),
+    )
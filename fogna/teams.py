@@ -0,0 +1,161 @@
+"""
+Nomi delle squadre: normalizzazione, alias e ricerca (🔎 Cerca Squadra)
+- Tabella team_aliases: chiave normalizzata di ogni grafia vista -> id della squadra canonica
+  (minuscole, senza accenti né punteggiatura, abbreviazioni comuni espanse)
+- Applicata durante il caricamento: "Bayern München" e "Bayern Munchen" sono la stessa squadra
+- Alias manuali per le grafie che la normalizzazione non riconosce ("Man United" -> "Man Utd"),
+  vedi storage.add_team_alias
+- Indice FTS5 trigram (team_search) sulle chiavi: ricerca mentre si scrive e nomi sbagliati
+  risolti senza leggere le partite
+"""
+
+import difflib
+import re
+import unicodedata
+
+ALIAS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS team_aliases (
+        key TEXT PRIMARY KEY,
+        team_id INTEGER NOT NULL REFERENCES teams (id),
+        alias TEXT NOT NULL,
+        manual INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+'''
+
+# Una riga per alias: la chiave divisa in trigrammi (la squadra si legge da team_aliases)
+SEARCH_SCHEMA = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS team_search USING fts5(key, tokenize = 'trigram')
+'''
+
+INSERT_ALIAS = "INSERT INTO team_aliases (key, team_id, alias, manual) VALUES (?, ?, ?, ?)"
+INSERT_SEARCH = "INSERT INTO team_search (key) VALUES (?)"
+
+# Grafia -> squadra canonica (chiave primaria, nessuna scansione)
+RESOLVE = '''
+    SELECT t.name FROM team_aliases a
+    JOIN teams t ON t.id = a.team_id
+    WHERE a.key = ?
+'''
+
+# Chiavi che iniziano con il testo (ricerche di 1-2 caratteri: troppo corte per i trigrammi)
+PREFIX_SEARCH = '''
+    SELECT a.key, a.alias, t.name FROM team_aliases a
+    JOIN teams t ON t.id = a.team_id
+    WHERE a.key >= ? AND a.key < ?
+    LIMIT ?
+'''
+
+# Chiavi con almeno un trigramma in comune, dalle più simili (bm25)
+TRIGRAM_SEARCH = '''
+    SELECT s.key, a.alias, t.name FROM team_search s
+    JOIN team_aliases a ON a.key = s.key
+    JOIN teams t ON t.id = a.team_id
+    WHERE team_search MATCH ?
+    ORDER BY rank
+    LIMIT ?
+'''
+
+# Grafie di una squadra (pagina di ricerca)
+TEAM_ALIASES = '''
+    SELECT a.alias, a.manual FROM team_aliases a
+    JOIN teams t ON t.id = a.team_id
+    WHERE t.name = ?
+    ORDER BY a.alias
+'''
+
+# Stagioni di una squadra dalla tabella aggregata (pagina di ricerca)
+TEAM_SEASONS = '''
+    SELECT season, league,
+           home_played + away_played, home_wins + away_wins, home_draws + away_draws,
+           home_losses + away_losses, home_gf + away_gf, home_ga + away_ga,
+           home_points + away_points
+    FROM team_season_stats
+    WHERE team = ?
+    ORDER BY season DESC, league
+'''
+
+# Abbreviazioni espanse e parole ignorate nella chiave
+ABBREVIATIONS = {'utd': 'united', 'st': 'saint', 'ste': 'sainte'}
+IGNORED_WORDS = {'fc', 'cf'}
+
+# Lettere che la scomposizione Unicode non separa dall'accento
+_LETTERS = str.maketrans({'ß': 'ss', 'ø': 'o', 'Ø': 'o', 'æ': 'ae', 'Æ': 'ae', 'đ': 'd', 'ł': 'l', 'Ł': 'l', 'ı': 'i'})
+
+# Candidati letti dall'indice e somiglianza minima per un risultato
+CANDIDATES = 50
+MIN_SCORE = 0.5
+
+
+def normalize(name):
+    """Chiave di confronto di un nome: minuscole, senza accenti, punteggiatura e parole ignorate"""
+    text = unicodedata.normalize('NFKD', str(name).translate(_LETTERS))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    words = [ABBREVIATIONS.get(w, w) for w in re.split(r'[\W_]+', text) if w]
+    key = ' '.join(w for w in words if w not in IGNORED_WORDS)
+    # Un nome fatto solo di parole ignorate ("FC") resta sé stesso
+    return key or ' '.join(words)
+
+
+def add_alias(conn, key, team_id, alias, manual=False):
+    """Salva una grafia e la aggiunge all'indice di ricerca (senza commit)"""
+    conn.execute(INSERT_ALIAS, (key, team_id, alias, int(manual)))
+    conn.execute(INSERT_SEARCH, (key,))
+
+
+def team_ids(conn, names):
+    """Id delle squadre canoniche per i nomi letti da un file (le grafie nuove diventano squadre)"""
+    keys = {name: normalize(name) for name in names if name is not None}
+    known = {}
+    unique = list(set(keys.values()))
+    for start in range(0, len(unique), 500):
+        part = unique[start:start + 500]
+        known.update(conn.execute(
+            f"SELECT key, team_id FROM team_aliases WHERE key IN ({', '.join('?' for _ in part)})", part
+        ).fetchall())
+
+    for name, key in sorted(keys.items()):
+        if key in known:
+            continue
+        conn.execute("INSERT OR IGNORE INTO teams (name) VALUES (?)", (name,))
+        team_id = conn.execute("SELECT id FROM teams WHERE name = ?", (name,)).fetchone()[0]
+        add_alias(conn, key, team_id, name)
+        known[key] = team_id
+    return {name: known[key] for name, key in keys.items()}
+
+
+def _trigram_query(key):
+    """Espressione MATCH: uno qualsiasi dei trigrammi della chiave"""
+    trigrams = sorted({key[i:i + 3] for i in range(len(key) - 2)})
+    return ' OR '.join('"{}"'.format(t.replace('"', '""')) for t in trigrams)
+
+
+def search_teams(conn, text, limit=10):
+    """Squadre che somigliano al testo: [(squadra canonica, grafia trovata, somiglianza)] dalla più simile"""
+    key = normalize(text)
+    if not key:
+        return []
+    if len(key) < 3:
+        rows = conn.execute(PREFIX_SEARCH, (key, key + '\uffff', CANDIDATES)).fetchall()
+    else:
+        rows = conn.execute(TRIGRAM_SEARCH, (_trigram_query(key), CANDIDATES)).fetchall()
+
+    best = {}
+    for found, alias, team in rows:
+        # Testo contenuto nella grafia (ricerca mentre si scrive): prima di tutto il resto
+        rank = (key in found, difflib.SequenceMatcher(None, key, found).ratio())
+        if not rank[0] and rank[1] < MIN_SCORE:
+            continue
+        if team not in best or rank > best[team][0]:
+            best[team] = (rank, alias)
+
+    ordered = sorted(best.items(), key=lambda item: (-item[1][0][0], -item[1][0][1], item[0]))
+    return [(team, alias, round(rank[1], 2)) for team, (rank, alias) in ordered[:limit]]
+
+
+def resolve_team(conn, text):
+    """Squadra canonica di una grafia qualsiasi (None se nessuna somiglia abbastanza)"""
+    row = conn.execute(RESOLVE, (normalize(text),)).fetchone()
+    if row:
+        return row[0]
+    results = search_teams(conn, text, limit=1)
+    return results[0][0] if results else None
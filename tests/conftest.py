@@ -0,0 +1,37 @@
+"""
+Fixture comuni dei test: workbook di prova e database in memoria
+"""
+
+import openpyxl
+import pytest
+
+from fogna import storage
+
+
+def _workbook(path, dates, goals=(1, 0)):
+    """Workbook con un foglio E0 e una partita per data (None = cella vuota)"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = 'E0'
+    ws.append(['Div', 'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG'])
+    for i, date in enumerate(dates):
+        ws.append(['E0', date, f'Casa {i}', f'Trasferta {i}', *goals])
+    wb.save(path)
+    return path
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """Crea all-euro-data-2023-2024.xlsx (o il nome indicato) nella cartella del test"""
+    def make(dates, goals=(1, 0), name='all-euro-data-2023-2024.xlsx'):
+        return _workbook(tmp_path / name, dates, goals)
+    return make
+
+
+@pytest.fixture
+def conn():
+    """Database in memoria con lo schema completo"""
+    conn = storage.connect(':memory:')
+    storage.create_schema(conn)
+    yield conn
+    conn.close()
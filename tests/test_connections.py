@@ -0,0 +1,41 @@
+"""
+Connessioni di lettura e snapshot pubblicati durante una lettura
+"""
+
+from fogna import storage
+from fogna.connections import ConnectionManager
+
+
+def _manager(tmp_path, workbook, seasons):
+    manager = ConnectionManager(str(tmp_path / 'fogna.db'))
+    for season in seasons:
+        path = workbook(['01/08/2023', '02/08/2023', '03/08/2023'], name=f'all-euro-data-{season}.xlsx')
+        with manager.writer() as writer:
+            storage.ingest_workbook(writer, str(path), season)
+    return manager
+
+
+def test_reader_survives_two_publishes(tmp_path, workbook):
+    manager = _manager(tmp_path, workbook, ['2021-2022', '2022-2023', '2023-2024'])
+
+    cursor = manager.reader().execute("SELECT id FROM matches")
+    assert len(cursor.fetchmany(2)) == 2
+
+    # Due scritture (due snapshot nuovi) mentre la lettura è ancora aperta
+    for season in ('2021-2022', '2022-2023'):
+        with manager.writer() as writer:
+            storage.delete_season(writer, season)
+        manager.reader()
+
+    assert len(cursor.fetchall()) == 7
+    assert manager.reader().execute("SELECT COUNT(*) FROM matches").fetchone()[0] == 3
+
+
+def test_dedicated_reader_keeps_its_snapshot(tmp_path, workbook):
+    manager = _manager(tmp_path, workbook, ['2023-2024'])
+
+    with manager.dedicated_reader() as conn:
+        with manager.writer() as writer:
+            storage.delete_season(writer, '2023-2024')
+        assert conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0] == 3
+    assert manager.reader().execute("SELECT COUNT(*) FROM matches").fetchone()[0] == 0
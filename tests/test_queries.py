@@ -0,0 +1,18 @@
+"""
+Controllo dei piani di esecuzione su un database piccolo già analizzato
+"""
+
+from fogna import queries, storage
+
+
+def test_query_plans_ignore_small_database_statistics(tmp_path, workbook):
+    path = str(tmp_path / 'fogna.db')
+    conn = storage.connect(path)
+    storage.create_schema(conn)
+    storage.ingest_workbook(conn, str(workbook([f'{d:02d}/08/2023' for d in range(1, 13)])), '2023-2024')
+    # Con le statistiche di poche righe SQLite sceglierebbe le scansioni complete
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+
+    assert queries.main([path]) == 0
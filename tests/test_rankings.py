@@ -0,0 +1,42 @@
+"""
+BEST Teams: percentuale di vittorie e tabella aggregata
+"""
+
+import sqlite3
+
+import numpy as np
+
+from fogna import rankings
+
+
+def test_win_pct_rounds_like_sqlite():
+    played = np.array([p for p in range(1, 61) for _ in range(p + 1)])
+    wins = np.array([w for p in range(1, 61) for w in range(p + 1)])
+
+    expected = [
+        sqlite3.connect(':memory:').execute(
+            "SELECT ROUND(CAST(? AS FLOAT) / ? * 100, 1)", (int(w), int(p))
+        ).fetchone()[0]
+        for w, p in zip(wins, played)
+    ]
+
+    assert list(rankings._win_pct(wins, played)) == expected
+
+
+def test_win_pct_halves_with_16_matches():
+    assert list(rankings._win_pct(np.array([9, 5, 3]), np.array([16, 16, 16]))) == [56.3, 31.3, 18.8]
+
+
+def test_rankings_across_seasons():
+    rows = [
+        ('Inter', 'I1', '2022-2023', 16, 9, 4, 3, 31),
+        ('Inter', 'I1', '2023-2024', 16, 5, 6, 5, 21),
+        ('Milan', 'I1', '2023-2024', 10, 5, 0, 5, 15),
+    ]
+
+    per_season, across = rankings.compute_rankings(rows)
+
+    assert list(per_season['win_pct']) == [56.3, 31.3, 50.0]
+    inter = across[across['team'] == 'Inter'].iloc[0]
+    assert (inter['played'], inter['wins'], inter['win_pct']) == (32, 14, 43.8)
+    assert inter['season'] == '2022-2023 → 2023-2024 (2)'
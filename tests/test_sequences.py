@@ -0,0 +1,36 @@
+"""
+Sequenze delle squadre con partite senza data
+"""
+
+from fogna import storage
+
+
+def test_ingest_workbook_with_blank_date(workbook, conn):
+    path = workbook(['01/08/2023', None])
+
+    result = storage.ingest_workbook(conn, str(path), '2023-2024')
+
+    assert result['rows'] == 1
+    assert result['undated'] == 1
+    assert conn.execute("SELECT COUNT(*) FROM team_sequences").fetchone()[0] == 2
+
+    # Ricaricare lo stesso file non duplica nulla
+    storage.ingest_workbook(conn, str(path), '2023-2024', overwrite=True)
+    assert conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0] == 1
+
+
+def test_sequences_ignore_stored_undated_matches(workbook, conn):
+    storage.ingest_workbook(conn, str(workbook(['01/08/2023'])), '2023-2024')
+
+    # Partita senza data rimasta da un caricamento precedente
+    season_id = conn.execute("SELECT id FROM seasons").fetchone()[0]
+    league_id, home_id, away_id = conn.execute(
+        "SELECT league_id, home_id, away_id FROM match_data"
+    ).fetchone()
+    row = (99, league_id, None, None, away_id, home_id, 2, 2) + (None,) * 16
+    conn.execute(storage.INSERT_MATCH.format(table=storage.partition_name(season_id)), row)
+
+    storage.refresh_materialized(conn, ['2023-2024'])
+
+    counts = conn.execute("SELECT matches FROM team_sequences").fetchall()
+    assert counts == [(1,), (1,)]
@@ -0,0 +1,40 @@
+"""
+Classifiche: pari merito risolti con la classifica avulsa (scontri diretti)
+"""
+
+import pandas as pd
+
+from fogna.standings import compute_standings
+
+
+def _matches(results):
+    return pd.DataFrame(results, columns=['home_team', 'away_team', 'fthg', 'ftag'])
+
+
+def test_two_way_tie_uses_head_to_head():
+    # A e B: 3 punti, 1 gol fatto e 1 subito a testa; B ha battuto A
+    table = compute_standings(_matches([
+        ('B', 'A', 1, 0),
+        ('A', 'C', 1, 0),
+        ('D', 'B', 1, 0),
+    ]))
+
+    assert list(table['team']) == ['D', 'B', 'A', 'C']
+
+
+def test_three_way_tie_uses_head_to_head_table():
+    # A, B e C a pari punti, differenza reti e gol fatti; la classifica avulsa
+    # (una vittoria a testa) le separa per differenza reti: A +2, C 0, B -2
+    table = compute_standings(_matches([
+        ('A', 'B', 3, 0),
+        ('B', 'C', 1, 0),
+        ('C', 'A', 1, 0),
+        ('A', 'D', 3, 2),
+        ('B', 'D', 5, 0),
+        ('C', 'D', 5, 2),
+    ]))
+
+    assert list(table['team']) == ['A', 'C', 'B', 'D']
+    assert table['points'].tolist()[:3] == [6, 6, 6]
+    assert table['gd'].tolist()[:3] == [3, 3, 3]
+    assert table['gf'].tolist()[:3] == [6, 6, 6]
@@ -0,0 +1,112 @@
+"""
+Caricamento delle partite: migrazione del vecchio schema, upsert e sovrascrittura
+"""
+
+from fogna import storage
+
+# Tabella unica delle prime versioni dell'app (testo ripetuto in ogni riga)
+LEGACY_SCHEMA = f"""
+    CREATE TABLE matches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        div TEXT, date TEXT, time TEXT, home_team TEXT, away_team TEXT,
+        {', '.join(f'{c} TEXT' if c in ('ftr', 'htr') else f'{c} INTEGER' for c in storage.STAT_COLUMNS)},
+        season TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def _count(conn, sql):
+    return conn.execute(sql).fetchone()[0]
+
+
+def test_overwrite_with_undated_file_keeps_season(workbook, conn):
+    storage.ingest_workbook(conn, str(workbook(['01/08/2023', '02/08/2023'])), '2023-2024')
+    generation = storage.data_generation(conn)
+
+    undated = workbook([None, 'non una data'], name='all-euro-data-2023-2024-vuoto.xlsx')
+    result = storage.ingest_workbook(conn, str(undated), '2023-2024', overwrite=True)
+
+    # Nessuna partita valida: la stagione resta com'era, statistiche comprese
+    assert result['rows'] == 0
+    assert result['undated'] == 2
+    assert _count(conn, "SELECT COUNT(*) FROM matches") == 2
+    assert _count(conn, "SELECT SUM(home_played + away_played) FROM team_season_stats") == 4
+    assert _count(conn, "SELECT COUNT(*) FROM file_fingerprints") > 0
+    assert storage.data_generation(conn) == generation
+
+
+def test_bulk_load_ignores_empty_chunks(workbook, conn):
+    from fogna.ingest import _build_chunk
+
+    storage.ingest_workbook(conn, str(workbook(['01/08/2023'])), '2023-2024')
+
+    assert storage.bulk_load(conn, [_build_chunk([])], season='2023-2024', overwrite=True) == 0
+    assert _count(conn, "SELECT COUNT(*) FROM matches") == 1
+
+
+def test_migrate_legacy_matches_keeps_last_loaded_duplicate(tmp_path):
+    path = str(tmp_path / 'legacy.db')
+    legacy = storage.connect(path)
+    legacy.execute(LEGACY_SCHEMA)
+    legacy.executemany(
+        "INSERT INTO matches (div, date, home_team, away_team, fthg, ftag, season) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            ('E0', '2023-08-01 00:00:00', 'Arsenal', 'Chelsea', 1, 0, '2023-2024'),
+            ('E0', '2023-08-08 00:00:00', 'Chelsea', 'Arsenal', 2, 2, '2023-2024'),
+            # Stessa partita caricata di nuovo con il risultato corretto
+            ('E0', '2023-08-01 00:00:00', 'Arsenal', 'Chelsea', 3, 1, '2023-2024'),
+            ('E0', '2022-08-01 00:00:00', 'Arsenal', 'Chelsea', 0, 0, '2022-2023'),
+        ],
+    )
+    legacy.commit()
+    legacy.close()
+
+    conn = storage.connect(path)
+    storage.create_schema(conn)
+
+    assert len(storage.partitions(conn)) == 2
+    assert conn.execute(
+        "SELECT season, date, home_team, fthg, ftag FROM matches ORDER BY date"
+    ).fetchall() == [
+        ('2022-2023', '2022-08-01', 'Arsenal', 0, 0),
+        ('2023-2024', '2023-08-01', 'Arsenal', 3, 1),
+        ('2023-2024', '2023-08-08', 'Chelsea', 2, 2),
+    ]
+    assert _count(conn, "SELECT home_played + away_played FROM team_season_stats "
+                        "WHERE team = 'Arsenal' AND season = '2023-2024'") == 2
+    assert not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'matches'").fetchone()
+    conn.close()
+
+
+def test_bulk_load_upserts_matches(workbook, conn):
+    from fogna.ingest import iter_workbook
+
+    path = str(workbook(['01/08/2023', '02/08/2023']))
+    storage.bulk_load(conn, iter_workbook(path, '2023-2024'), season='2023-2024')
+    ids = conn.execute("SELECT id FROM matches ORDER BY id").fetchall()
+
+    # Stesso file con risultati diversi: stesse partite, stessi id, valori aggiornati
+    path = str(workbook(['01/08/2023', '02/08/2023'], goals=(2, 2)))
+    assert storage.bulk_load(conn, iter_workbook(path, '2023-2024'), season='2023-2024') == 2
+
+    assert conn.execute("SELECT id FROM matches ORDER BY id").fetchall() == ids
+    assert conn.execute("SELECT DISTINCT fthg, ftag FROM matches").fetchall() == [(2, 2)]
+    assert _count(conn, "SELECT SUM(home_draws) FROM team_season_stats") == 2
+
+
+def test_overwrite_replaces_only_its_season(workbook, conn):
+    storage.ingest_workbook(conn, str(workbook(['01/08/2022'], name='all-euro-data-2022-2023.xlsx')), '2022-2023')
+    storage.ingest_workbook(conn, str(workbook(['01/08/2023', '02/08/2023', '03/08/2023'])), '2023-2024')
+    generation = storage.data_generation(conn)
+
+    shorter = workbook(['01/09/2023'], goals=(0, 3), name='all-euro-data-2023-2024-nuovo.xlsx')
+    result = storage.ingest_workbook(conn, str(shorter), '2023-2024', overwrite=True)
+
+    assert result['rows'] == 1
+    assert conn.execute("SELECT season, COUNT(*) FROM matches GROUP BY season ORDER BY season").fetchall() == [
+        ('2022-2023', 1), ('2023-2024', 1),
+    ]
+    assert _count(conn, "SELECT SUM(home_played) FROM team_season_stats WHERE season = '2023-2024'") == 1
+    assert _count(conn, "SELECT SUM(away_wins) FROM team_season_stats WHERE season = '2023-2024'") == 1
+    assert storage.data_generation(conn) != generation